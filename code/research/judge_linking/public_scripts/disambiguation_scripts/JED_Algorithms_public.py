@@ -1,8 +1,10 @@
 import tqdm
-from collections import defaultdict, Counter
-import re
+from bisect import bisect_right
+from collections import defaultdict
+from functools import lru_cache
 
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process
+import numpy as np
 import pandas as pd
 
 import JED_Globals_public as JG
@@ -28,55 +30,46 @@ def FINAL_CLEANUP(PCID_Mappings: pd.DataFrame):
     # I only need the unique list of entities by ucid to run through the final check
     mapper_frame = PCID_Mappings[['ucid','extracted_entity','Points_To', 'SJID']].drop_duplicates()
 
-    # I will be building a map by ucid of all entities marked as good (known judge with SJID) or "inconclusive"
-    the_map = {}
-    # cleaned ent was the original extraction, final ent is the pointer or parent entity
-    for ucid, cleaned_ent, final_ent, SJID in [tuple(x) for x in mapper_frame.to_numpy()]:
-        has_sjid = True
-        if SJID == 'Inconclusive':
-            has_sjid = False
+    # only ucids with at least one inconclusive entity need reviewing, narrow the frame down to their rows
+    is_inconclusive = mapper_frame.SJID.eq('Inconclusive')
+    review_frame = mapper_frame[mapper_frame.ucid.isin(mapper_frame.ucid[is_inconclusive])]
 
+    # the entities to review, by ucid: the set of entities marked as good (known judge with SJID) and the set marked "inconclusive"
+    review = {}
+    # cleaned ent was the original extraction, final ent is the pointer or parent entity
+    for ucid, cleaned_ent, final_ent, SJID in zip(review_frame.ucid.tolist(), review_frame.extracted_entity.tolist(),
+                                                  review_frame.Points_To.tolist(), review_frame.SJID.tolist()):
+        if ucid not in review:
+            review[ucid] = {"Good": set(), "Inconclusive": set()}
         # note the ordering of the tuples flips them from when they come in
-        if ucid not in the_map:
-            if has_sjid:
-                the_map[ucid] = {"Good": [(final_ent, cleaned_ent, SJID)],"Inconclusive": []}
-            else:
-                the_map[ucid] = {"Good": [],"Inconclusive": [(final_ent, cleaned_ent, SJID)]}
+        if SJID == 'Inconclusive':
+            review[ucid]["Inconclusive"].add((final_ent, cleaned_ent, SJID))
         else:
-            if has_sjid:
-                the_map[ucid]["Good"].append((final_ent, cleaned_ent, SJID))
-            else:
-                the_map[ucid]["Inconclusive"].append((final_ent, cleaned_ent, SJID))
-
-    # the entities to review will be any entity list from a ucid that is marked as inconclusive
-    review = {}
-    for ucid, ents in the_map.items():
-        if ents['Inconclusive']:
-            # if the ucid had inconclusive entities, keep the set of good and inconclusive ones in the reviewer dict
-            review[ucid] = {k:set(v) for k,v in ents.items()}
+            review[ucid]["Good"].add((final_ent, cleaned_ent, SJID))
 
     # updater will track which inconclusive entities we were able to update and point towards an SJID
     updater = []
     for ucid, ents in tqdm.tqdm(review.items()):
-        # for every ucid, and each inconclusive entity
-        for each in ents['Inconclusive']:
+        # fix an order for the entity sets so they can be scored as matrices
+        inconclusives = list(ents['Inconclusive'])
+        goods = list(ents['Good'])
+        # score every inconclusive entity against every known SJID entity in one call each:
+        # the pointer entities against each other, and the original entities against each other (anything under 90 is 0)
+        pointer_scores = process.cdist([each[0] for each in inconclusives], [good[0] for good in goods],
+                                       scorer=fuzz.partial_ratio, score_cutoff=90)
+        original_scores = process.cdist([each[1] for each in inconclusives], [good[1] for good in goods],
+                                        scorer=fuzz.partial_ratio, score_cutoff=90)
+        # if the pointer entities match or the original entities match, it is a match
+        matches = (pointer_scores>=90) | (original_scores>=90)
+        # only inconclusive entities with exactly one good match from the JEL entities can be updated
+        for row in np.flatnonzero(matches.sum(axis=1)==1):
+            each = inconclusives[row]
             badname = each[0] # the entity we will compare
-            original = each[1] # what the entity originally looked like
-            m_count = [] # match counter
-            # compare against the names of all the known SJID entities
-            for good in ents['Good']:
-                goodname = good[0] # name of entity with sjid to compare
-                g_original = good[1] # original form of the entity
-
-                # if the pointer entities match or the original entities match, add it as a match
-                if fuzz.partial_ratio(badname,goodname)>=90 or fuzz.partial_ratio(original,g_original)>=90:
-                    m_count.append(good)
-
-            # if there is only one good match from the JEL entities
-            # and the matched entity is a substring of the known judge, match it
+
+            # if the matched entity is a substring of the known judge, match it
             # this effectively matches ambiguous single token names on a docket
-            if len(m_count)==1 and len([i for i in ents['Good'] if badname in i[0]])==1:
-                good = m_count[0]
+            if len([i for i in goods if badname in i[0]])==1:
+                good = goods[np.flatnonzero(matches[row])[0]]
                 updater.append({"ucid": ucid,
                                 "Points_To": each[0],
                                 "New_Point": good[0],
@@ -127,38 +120,22 @@ def PIPE_Free_Exact_Beginning(nodes: list):
     
     # we will only consider the nodes that remain eligible to be mapped to each other
     eligible_nodes = [N for N in nodes if N.eligible]
-    
-    # we begin iteration at the beginning of the list
-    start = 0
-    # the iterables are the whole list
-    it_list = eligible_nodes[start:]
-
-    # while there remains entities in the list we haven't compared, keep going
-    while it_list:
-        # the beginning node we will compare too
-        this = eligible_nodes[start]
-        # the remaining peers to compare to it
-        those = eligible_nodes[start+1:]
-
-        # advance the parameters of our while loop for the next iteration
-        start+=1
-        it_list = eligible_nodes[start:]
-
-        # the search checks again for those that remain eligible
-        # it is possible one of the nodes was originally eligible upon creation of the it_list, but has since been mapped to another node
-        # and is now ineligible
-        search = [o for o in those if o.eligible]
-        # default to having no matched nodes
-        matches = []
 
-        # if there is a remaining list to search after eligibility checks, and this node remains eligible
-        if search and this.eligible:
-            # begin the search
-            for that in search:
-                # criterion: strings match exactly for their names
-                if that.name == this.name:
-                    # if satisfied, add it to the list of possible matches
-                    matches.append(that)
+    # criterion: strings match exactly for their names
+    # look up the positions of the nodes sharing this exact name
+    by_name = defaultdict(list)
+    for position, N in enumerate(eligible_nodes):
+        by_name[N.name].append(position)
+
+    # walk the nodes in order, each one is compared to the nodes after it
+    for i, this in enumerate(eligible_nodes):
+        # if this node was mapped to another node while walking an earlier one, it is done
+        if not this.eligible:
+            continue
+        # the later nodes with the same name that remain eligible are the possible matches
+        # it is possible one of the nodes was originally eligible upon creation of eligible_nodes, but has since been mapped
+        # to another node and is now ineligible
+        matches = [eligible_nodes[j] for j in by_name[this.name] if j > i and eligible_nodes[j].eligible]
 
         # if names were considered a match
         if matches:
@@ -189,34 +166,34 @@ def PIPE_Free_Fuzzy_Pool_Based(nodes: list):
     # we will only consider the nodes that remain eligible to be mapped to each other
     eligible_nodes = [N for N in nodes if N.eligible]
     
-    # we begin iteration at the beginning of the list
-    start = 0
-    # the iterables are the whole list
-    it_list = eligible_nodes[start:]
-
-    # while there remains entities in the list we haven't compared, keep going
-    while it_list:
-        this = eligible_nodes[start] # entity to compare
-        those = eligible_nodes[start+1:] # other entities to test
-        start+=1 # iterables
-        it_list = eligible_nodes[start:] # iterables
-
-        # only the eligible ones to compare (if an entity got mapped during an earlier iterated entity, we don't want to map to it)
-        search = [o for o in those if o.eligible]
+    n_eligible = len(eligible_nodes)
+    # fuzzy match bound
+    bound = 95
+
+    # a ratio that high is only reachable between names of similar lengths, so bucket the multi-token names
+    # (single tokens are never compared) by name length once, and note which length buckets are in reach of each other
+    by_length, reachable_lengths = length_buckets([len(N.name) if N.token_length>1 else None for N in eligible_nodes], bound)
+    # then score the buckets in reach against each other in batched calls
+    in_reach = candidates_in_reach([N.name for N in eligible_nodes], by_length, reachable_lengths, bound)
+
+    # compare every pair once: [A, B, C, D] --> AB, AC, AD, BC, BD, CD
+    for i in range(n_eligible):
+        this = eligible_nodes[i] # entity to compare
+
         matches = []
 
-        if search and this.eligible:
+        if this.eligible:
             # this function does not handle single token entities, fuzzy matching on single tokens is bad
             if this.token_length==1:
                 continue
-            for that in search:
-                # if the possible match is a single token, move on
-                if that.token_length==1:
+            # the later multi-token entities that scored near the bound, walked in their original order
+            for j in in_reach.get(i, []):
+                that = eligible_nodes[j]
+                # only the eligible ones to compare (if an entity got mapped during an earlier iterated entity, we don't want to map to it)
+                if not that.eligible:
                     continue
-                # fuzzy match bound
-                bound = 95
                 # the full entity name needs to fuzzy match above this bound
-                if fuzz.ratio(this.name, that.name) >=bound:
+                if fuzz.ratio(this.name, that.name, score_cutoff=bound) >=bound:
                     # consider it as a possible match
                     matches.append(that)
         # if possible matches were found
@@ -247,39 +224,37 @@ def PIPE_Free_Tokens_in_Tokens_Pool_Based(nodes: list, abbreviated_first: bool,
 
     # we will only consider the nodes that remain eligible to be mapped to each other
     eligible_nodes = [N for N in nodes if N.eligible]
+    # the pool of tokens to use in comparison for every node
+    # the pool is based on the abbreviation and string standardization style args
+    pools = [node_pool(N, abbreviated_first, abbreviated_middle, style) for N in eligible_nodes]
+    # blocking: only walk the pairs whose pools could possibly match (see pool_block_index)
+    block_index = pool_block_index(pools)
     
-    # we begin iteration at the beginning of the list
-    start = 0
-    # the iterables are the whole list
-    it_list = eligible_nodes[start:]
-    while it_list:
-        this = eligible_nodes[start] # object to compare
-        those = eligible_nodes[start+1:] # objects to be compared
+    n_eligible = len(eligible_nodes)
 
-        start+=1 # iterables
-        it_list = eligible_nodes[start:] # iterables
+    # compare every pair once: [A, B, C, D] --> AB, AC, AD, BC, BD, CD
+    for i in range(n_eligible):
+        this = eligible_nodes[i] # object to compare
 
         # function not equipped to handle single token entities.
         # We DONT want to match Brown to Brown in freematching, since we dont know they are truly the same across courts
         if this.token_length==1:
             continue
         
-         # only the eligible ones to compare (if an entity got mapped during an earlier iterated entity, we don't want to map to it)
-        search = [o for o in those if o.eligible]
         matches = []
 
-        if search and this.eligible:
-            for that in search:
+        if this.eligible:
+            for j in later_pool_candidates(block_index, i):
+                that = eligible_nodes[j]
+                # only the eligible ones to compare (if an entity got mapped during an earlier iterated entity, we don't want to map to it)
+                if not that.eligible:
+                    continue
                 # again VETO single-token entities
                 if that.token_length==1:
                     continue
 
-                # create a pool of tokens to use in comparison
-                # the pool is based on the abbreviation and string standardization style args
-                this_pool, that_pool = pool_creator(this, that, abbreviated_first, abbreviated_middle, style)
-
                 # run the pools against each other to determine if one pools tokens are entirely in the other
-                if pool_runner(this_pool, that_pool):
+                if pool_runner(pools[i], pools[j]):
                     # the pool runner is a bool for "Yes the tokens of one are in the other" or "No"
                     # richard b should not match richard b jones -- too ambiguous
                     # if the final regular token is one character, we will not consider the name variant
@@ -334,40 +309,46 @@ def PIPE_Free_Vacuum_Pool_Based(nodes: list):
     # we will only consider the nodes that remain eligible to be mapped to each other
     eligible_nodes = [N for N in nodes if N.eligible]
     
-    # we begin iteration at the beginning of the list
-    start = 0
-    # the iterables are the whole list
-    it_list = eligible_nodes[start:]
-
-    while it_list:
-        this = eligible_nodes[start] # object to compare
-        those = eligible_nodes[start+1:] # objects to be compared to
-        start+=1 # iterables
-        it_list = eligible_nodes[start:] # iterables
-
-        # only the eligible ones to compare (if an entity got mapped during an earlier iterated entity, we don't want to map to it)
-        search = [o for o in those if o.eligible]
+    n_eligible = len(eligible_nodes)
+
+    # blocking: the surnames need to match at 85, which is only reachable between surnames of similar lengths
+    # so bucket the multi-token names (single tokens are never compared) by surname length once
+    by_anchor_length, reachable_lengths = length_buckets([len(N.anchor) if N.token_length>1 else None for N in eligible_nodes], 85)
+    # create the "vacuumed" names for every entity
+    # Christian John Rozolis becomes Christian Rozolis
+    # (the first and last suffixless tokens are held on the node as first_token and anchor)
+    first_tokens = [N.first_token for N in eligible_nodes]
+    anchors = [N.anchor for N in eligible_nodes]
+    # then score the surname buckets in reach against each other in batched calls, keeping the later entities whose
+    # surnames could clear the bound (the exact check still runs below)
+    in_reach = candidates_in_reach(anchors, by_anchor_length, reachable_lengths, 85)
+
+    # compare every pair once: [A, B, C, D] --> AB, AC, AD, BC, BD, CD
+    for i in range(n_eligible):
+        this = eligible_nodes[i] # object to compare
+
         matches = []
 
-        if search and this.eligible:
+        if this.eligible:
             # function not equipped to handle single token entities
             if this.token_length==1:
                 continue
 
-            # create the "vacuumed" name
-            # Christian John Rozolis becomes Christian Rozolis
-            this_vacuumed = [this.tokens_wo_suff[0], this.tokens_wo_suff[-1]]
+            # this entity's vacuumed name
+            this_first, this_anchor = first_tokens[i], anchors[i]
 
-            for that in search:
-                # don't handle single token entities, make sure this entity is still eligible
-                if not this.eligible or that.token_length==1:
+            # only the later entities with a surname near the bound, in their original order
+            for j in in_reach.get(i, []):
+                that = eligible_nodes[j]
+                # only the eligible ones to compare (if an entity got mapped during an earlier iterated entity, we don't want to map to it)
+                if not that.eligible:
                     continue
-
-                # for the other entity to compare, build the vacuumed name
-                that_vacuumed = [that.tokens_wo_suff[0], that.tokens_wo_suff[-1]]
+                # single token entities were never bucketed, and this entity cannot be mapped mid-row (matches are only
+                # assessed once the row is done), so neither needs rechecking per candidate
 
                 # if the vacuumed names are similar
-                if fuzz.ratio(this_vacuumed[0], that_vacuumed[0])>=85 and fuzz.ratio(this_vacuumed[1], that_vacuumed[1])>=85:
+                # (first names and surnames are single tokens that recur across the whole dataset, so their scores are cached)
+                if token_ratio(this_first, first_tokens[j])>=85 and token_ratio(this_anchor, anchors[j])>=85:
                     # if the names are both long
                     if this.token_length>=3 and that.token_length>=3:
                         # and the second tokens first letters dont match, VETO
@@ -407,41 +388,44 @@ def PIPE_Free_Token_Sort_Pool_Based(nodes: list):
     # we will only consider the nodes that remain eligible to be mapped to each other
     eligible_nodes = [N for N in nodes if N.eligible]
     
-    # we begin iteration at the beginning of the list
-    start = 0
-    # the iterables are the whole list
-    it_list = eligible_nodes[start:]
-    while it_list:
-        this = eligible_nodes[start] # object to be compared
-        those = eligible_nodes[start+1:] # other objects to compare to
-        start+=1 # iterables
-        it_list = eligible_nodes[start:] # iterables
-
-        # only the eligible ones to compare (if an entity got mapped during an earlier iterated entity, we don't want to map to it)
-        search = [o for o in those if o.eligible]
+    n_eligible = len(eligible_nodes)
+    # fuzzy matching bound
+    bound = 98
+
+    # the token sort ratio is the plain ratio of the sorted token strings, sort each 3+ token name here
+    sorted_names = [" ".join(sorted(N.processed_name.split())) if N.token_length>2 else None for N in eligible_nodes]
+    # blocking: that bound is only reachable between strings of similar lengths, bucket by sorted token string length once
+    sorted_lengths = [len(name) if name is not None else None for name in sorted_names]
+    by_length, reachable_lengths = length_buckets(sorted_lengths, bound)
+
+    # compare every pair once: [A, B, C, D] --> AB, AC, AD, BC, BD, CD
+    for i in range(n_eligible):
+        this = eligible_nodes[i] # object to be compared
+
         matches = []
 
-        # if a search space remains, and this entity is eligible
-        if search and this.eligible:
+        # if this entity is eligible
+        if this.eligible:
             # function not equipped to handle single-token entities, and we err on the side of caution and only consider
             # entities with 3 or more tokens
             if this.token_length<=2:
                 continue
-            # for every other entity, check it
-            for that in search:
-                # will only compare to eligible 3+ token entities
-                # confirm in a prior loop that this entity was not mapped elsewhere, and that it remains eligible
-                if not this.eligible or that.token_length<=2:
+            # for every other entity in reach, check it
+            for j in later_in_reach(by_length, reachable_lengths, sorted_lengths[i], i):
+                that = eligible_nodes[j]
+                # only the eligible ones to compare (if an entity got mapped during an earlier iterated entity, we don't want to map to it)
+                if not that.eligible:
                     continue
-
-                # fuzzy matching bound
-                bound = 98
+                # will only compare to eligible 3+ token entities: shorter names were never bucketed, and this entity
+                # cannot be mapped mid-row (matches are only assessed once the row is done), so neither needs rechecking per candidate
 
                 # if their token sort ratios are strong matches, hooray
-                if fuzz.token_sort_ratio(this.base_tokens, that.base_tokens) >=bound:
+                # token based scorers get the same default processing fuzzywuzzy applied (lower case, punctuation stripped)
+                # which the nodes already hold in processed_name, and their sorted token strings were built above
+                if fuzz.ratio(sorted_names[i], sorted_names[j], score_cutoff=bound) >=bound:
 
-                    if this.tokens_wo_suff[0] == that.tokens_wo_suff[-1]+"s" or \
-                        that.tokens_wo_suff[0] == this.tokens_wo_suff[-1]+"s":
+                    if this.first_token == that.anchor+"s" or \
+                        that.first_token == this.anchor+"s":
                         # mark a roberts is not robert a marks (rolls eyes)
                         # john roberts, robert johns, etc.
                         # I cannot believe this problem exists
@@ -487,7 +471,8 @@ def PIPE_Free_Van_Sweeps_Pool_Based(nodes: list):
     # the entity may begin with the token van, or van as part of a longer name if the written form
     # did not maintain spacing
     # i.e. Van Kloet could have been written Vankloet. This pattern grabs both
-    for each in [o for o in nodes if re.search(r'^van | van',o.name) and o.eligible]:
+    # (a leading "van " or " van" anywhere)
+    for each in [o for o in nodes if o.eligible and (o.name.startswith('van ') or ' van' in o.name)]:
         # if the first token is not van we will attempt disambiguation for it in the van search
         # not too sure why I did this?? -- this function is meant for full names with Van in them
         # -- not for surname representations starting with van
@@ -508,18 +493,21 @@ def PIPE_Free_Van_Sweeps_Pool_Based(nodes: list):
 
     # now, using our newly constructed van names, see if they match up to the old ones
     # basically this leveled the field and compared them all as fuzed names VanHeusen, VanWeld, etc.
+    new_anchors = []
     for this, newname in new_vans:
         if this.suffix:
-            anchor = newname.split()[-2]
+            new_anchors.append(newname.split()[-2])
         else:
-            anchor = newname.split()[-1]
+            new_anchors.append(newname.split()[-1])
 
-        matches = []
-        for old in old_vans:
-            old_anchor = old.anchor
-            # now comparing fuzed VAN names as the anchors
-            if fuzz.ratio(anchor, old_anchor)>=90:
-                matches.append(old)
+    # now comparing fuzed VAN names as the anchors, every new van anchor against every old van anchor in one call
+    # (float scores so the >=90 check is exactly the one fuzz.ratio would give)
+    # this spans every van name in the dataset, so the rows are scored across all cores (rapidfuzz releases the GIL)
+    anchor_scores = process.cdist(new_anchors, [old.anchor for old in old_vans],
+                                  scorer=fuzz.ratio, score_cutoff=90, dtype=np.float64, workers=-1)
+
+    for row, (this, newname) in enumerate(new_vans):
+        matches = [old for old, score in zip(old_vans, anchor_scores[row]) if score>=90]
         
         if matches:
             this.assess_ambiguity(matches,  'Van Names', 'Free [6]')
@@ -564,26 +552,28 @@ def PIPE_Free_Initialisms_Pool_Based(nodes: list):
             len(each.base_tokens[1])==1:
             matchy.append(each)
 
+    # the long names we compare against
+    # both styles below are exact matches on a (first name, initial, initial) key of the long name,
+    # so each long name is filed under the keys it can match by and every candidate only looks its own key up
+    # eligibility does change as nodes are mapped, so that is checked as we go
+    long_nodes = defaultdict(list)
+    for o in nodes:
+        if o.token_length>=3:
+            # if the first letters match across the board and the first names match
+            long_nodes[(o.base_tokens[0], o.base_tokens[1][0], o.base_tokens[2][0])].append(o)
+            # if the first names match and the offset tokens from a longer name match
+            # i.e. Chris John Rozolis Stevens and Chris Rozolis Stevens
+            # (a name matching both ways is filed twice under the same key, and so still counted twice)
+            if len(o.base_tokens)>3:
+                long_nodes[(o.base_tokens[0], o.base_tokens[2][0], o.base_tokens[3][0])].append(o)
+
     # for all eligible to be matched
     for m in matchy:
         if not m.eligible:
             continue
-        # compare against all long names
-        matches = []
-
-        for n in [o for o in nodes if o.eligible and o!=m and o.token_length>=3]:
-            # if the first letters match across the board and the first names match
-            if n.base_tokens[0] == m.base_tokens[0] and \
-                n.base_tokens[1][0] == m.base_tokens[1][0] and\
-                n.base_tokens[2][0] == m.base_tokens[2][0]:
-                matches.append(n)
-    
-            # if the first names match and the offset tokens from a longer name match
-            # i.e. Chris John Rozolis Stevens and Chris Rozolis Stevens
-            if len(n.base_tokens)>3 and n.base_tokens[0] == m.base_tokens[0] and \
-                n.base_tokens[2][0] == m.base_tokens[1][0] and\
-                n.base_tokens[3][0] == m.base_tokens[2][0]:
-                matches.append(n)
+        # compare against all long names filed under this name's initialism
+        matches = [n for n in long_nodes.get((m.base_tokens[0], m.base_tokens[1][0], m.base_tokens[2][0]), [])
+                   if n.eligible and n is not m]
 
         # if we had names qualify as possible matches, assess ambiguity
         if matches:
@@ -612,38 +602,53 @@ def PIPE_Free_Single_Letter_Names_Pool_Based(nodes: list):
     """
 
     # only going to compare to long names and eligible names
-    for this in [o for o in nodes if o.eligible and o.token_length>=2]:
+    # eligibility is checked as we go
+    multi_nodes = [o for o in nodes if o.token_length>=2]
+
+    # a name can only match below if it shares the second token (first check) or the surname anchor (second check)
+    # bucket the multi-token names by both once, then each entity only walks the names in its two buckets
+    by_second_token = defaultdict(list)
+    by_anchor = defaultdict(list)
+    for position, o in enumerate(multi_nodes):
+        by_second_token[o.base_tokens[1]].append(position)
+        by_anchor[o.anchor].append(position)
+
+    # specifically care if the first token is a single letter
+    for this in [o for o in multi_nodes if len(o.base_tokens[0])==1]:
         if not this.eligible:
             continue
 
-        # specifically care if the first token is a single letter
-        if len(this.base_tokens[0])==1:
-
-            # compare against all other multi-tokened names
-            matches = []
-            for check in [o for o in nodes if o.eligible and o!=this and o.token_length>=2]:
-                # if they have a decent token sort ratio AND the second token is an exact match, then they're good
-                # i.e. a wallace tashima and atsushi wallace tashima
-                if fuzz.token_sort_ratio(this.name,check.name)>80 and this.base_tokens[1]==check.base_tokens[1]:
-                    matches.append(check)
-                # if their dual abbreviation forms are a strong match
-                # paul kinlock holmes iii and pk holmes iii match here
-                elif fuzz.ratio(this.init_init_sur_suff, check.init_init_sur_suff)>=92 and this.anchor==check.anchor:
-                    # if the second token in the words are both not abbreviated and dont equal each other, void the match
-                    if len(this.base_tokens[1])>1 and len(check.base_tokens[1])>1 and this.base_tokens[1] != check.base_tokens[1]:
-                        continue
-                    matches.append(check)
-            
-            # assess the matches for ambiguities
-            if matches:
-                this.assess_ambiguity(matches,  'Single Letters', 'Free [8]')
-                ## BLOCK BELOW IS DEV TESTING BLOCK
-                # if not this.assess_ambiguity(matches,  'Single Letters', 'Free [8]'):
-                #     print('failure')
-                #     print((this.name, this.courts, this.eligible, this.NID, this.BA_MAG_ID, this.serial_id, this.POINTS_TO_SID))
-                #     for m in matches:
-                #         print("--",(m.name, m.courts, m.eligible, m.NID, m.BA_MAG_ID, m.serial_id, m.POINTS_TO_SID))
-    
+        # compare against all other multi-tokened names that share a bucket, in their original order
+        candidates = sorted(set(by_second_token[this.base_tokens[1]]).union(by_anchor[this.anchor]))
+        matches = []
+        for position in candidates:
+            check = multi_nodes[position]
+            if not check.eligible or check is this:
+                continue
+            # if they have a decent token sort ratio AND the second token is an exact match, then they're good
+            # i.e. a wallace tashima and atsushi wallace tashima
+            # (the exact second token check is the cheap one, so it runs first and candidates that only share
+            # the surname bucket never pay for the token sort)
+            if this.base_tokens[1]==check.base_tokens[1] and fuzz.token_sort_ratio(this.processed_name, check.processed_name, score_cutoff=80)>80:
+                matches.append(check)
+            # if their dual abbreviation forms are a strong match
+            # paul kinlock holmes iii and pk holmes iii match here
+            elif this.anchor==check.anchor and fuzz.ratio(this.init_init_sur_suff, check.init_init_sur_suff, score_cutoff=92)>=92:
+                # if the second token in the words are both not abbreviated and dont equal each other, void the match
+                if len(this.base_tokens[1])>1 and len(check.base_tokens[1])>1 and this.base_tokens[1] != check.base_tokens[1]:
+                    continue
+                matches.append(check)
+        
+        # assess the matches for ambiguities
+        if matches:
+            this.assess_ambiguity(matches,  'Single Letters', 'Free [8]')
+            ## BLOCK BELOW IS DEV TESTING BLOCK
+            # if not this.assess_ambiguity(matches,  'Single Letters', 'Free [8]'):
+            #     print('failure')
+            #     print((this.name, this.courts, this.eligible, this.NID, this.BA_MAG_ID, this.serial_id, this.POINTS_TO_SID))
+            #     for m in matches:
+            #         print("--",(m.name, m.courts, m.eligible, m.NID, m.BA_MAG_ID, m.serial_id, m.POINTS_TO_SID))
+
     return nodes
     
 
@@ -651,6 +656,123 @@ def PIPE_Free_Single_Letter_Names_Pool_Based(nodes: list):
 ## Anchor and Single Token Functions ##
 #######################################
 
+def fuzz_bound_reachable(len_a: int, len_b: int, bound: int):
+    """cheap prefilter for fuzz.ratio calls. The ratio of two strings can never exceed 200*shorter/(combined length),
+    so if that ceiling is below the bound there is no reason to run the string comparison at all
+
+    Args:
+        len_a (int): character length of the first string
+        len_b (int): character length of the second string
+        bound (int): the fuzz.ratio score the comparison needs to reach
+
+    Returns:
+        bool: True if the bound could still be reached, False if the comparison is guaranteed to fail
+    """
+    # leave a point of slack so rounding in the fuzzy score can never flip a result
+    return 200*min(len_a, len_b) >= (bound-1)*(len_a+len_b)
+
+def length_buckets(lengths: list, bound: int):
+    """Bucket list positions by string length for the dataset-wide free pipes. A fuzz.ratio bound is only reachable
+    between strings of similar lengths (see fuzz_bound_reachable), so each string only needs to visit the buckets in reach
+
+    Args:
+        lengths (list): string length for each position in the list, None for positions that are never compared
+        bound (int): the fuzz.ratio score the comparisons need to reach
+
+    Returns:
+        dict, dict: key = length, value = ascending positions of that length; key = length, value = the lengths within reach of it
+    """
+    buckets = defaultdict(list)
+    for position, length in enumerate(lengths):
+        if length is not None:
+            buckets[length].append(position)
+    reachable = {L: [M for M in buckets if fuzz_bound_reachable(L, M, bound)] for L in buckets}
+    return buckets, reachable
+
+def later_in_reach(buckets: dict, reachable: dict, length: int, position: int):
+    """Given the length buckets of a list, find the later positions whose lengths are within reach of this one
+
+    Args:
+        buckets (dict): key = length, value = ascending positions of that length
+        reachable (dict): key = length, value = the lengths within reach of it
+        length (int): string length of the entity at this position
+        position (int): position of the entity in the list
+
+    Returns:
+        list: ascending positions after this one, in reach by length
+    """
+    return sorted(j for M in reachable[length] for j in buckets[M][bisect_right(buckets[M], position):])
+
+def candidates_in_reach(strings: list, buckets: dict, reachable: dict, bound: int, chunk: int=512):
+    """Score every pair of length buckets in reach of each other in batched rapidfuzz calls, and keep the later
+    positions that could clear the bound. Scores come back rounded to whole numbers, so the hits keep a point of slack
+    and still need the exact ratio
+
+    Args:
+        strings (list): string for each position in the list
+        buckets (dict): key = length, value = ascending positions of that length
+        reachable (dict): key = length, value = the lengths within reach of it
+        bound (int): the fuzz.ratio score the comparisons need to reach
+        chunk (int, optional): rows scored per call, keeps the score matrices small. Defaults to 512.
+
+    Returns:
+        dict: key = position, value = ascending later positions that could clear the bound
+    """
+    candidates = defaultdict(list)
+    for L, positions in buckets.items():
+        for M in reachable[L]:
+            # every bucket pair once
+            if M < L:
+                continue
+            others = buckets[M]
+            other_strings = [strings[j] for j in others]
+            for start in range(0, len(positions), chunk):
+                rows = positions[start:start+chunk]
+                # this spans the whole dataset, so the rows are scored across all cores (rapidfuzz releases the GIL)
+                scores = process.cdist([strings[i] for i in rows], other_strings,
+                                       scorer=fuzz.ratio, score_cutoff=bound-1, dtype=np.uint8, workers=-1)
+                for r, c in zip(*scores.nonzero()):
+                    i, j = rows[r], others[c]
+                    # a bucket scored against itself sees each pair both ways (and itself)
+                    if i < j:
+                        candidates[i].append(j)
+                    elif M != L:
+                        candidates[j].append(i)
+    for later in candidates.values():
+        later.sort()
+    return candidates
+
+# cached fuzz.ratio for single tokens (surnames, first names), the same common tokens get scored over and over across ucids
+_token_ratio = lru_cache(maxsize=2**18)(fuzz.ratio)
+
+def token_ratio(token_a: str, token_b: str):
+    """fuzz.ratio between two single tokens, memoized across calls (and ucids). The ratio is symmetric,
+    so the pair is put in a fixed order to share one cache entry both ways
+
+    Args:
+        token_a (str): first token
+        token_b (str): second token
+
+    Returns:
+        float: the fuzz.ratio score of the two tokens
+    """
+    if token_b < token_a:
+        return _token_ratio(token_b, token_a)
+    return _token_ratio(token_a, token_b)
+
+@lru_cache(maxsize=2**18)
+def token_partial_ratio(token_a: str, token_b: str):
+    """fuzz.partial_ratio between two single tokens, memoized across calls (and ucids)
+
+    Args:
+        token_a (str): first token
+        token_b (str): second token
+
+    Returns:
+        float: the fuzz.partial_ratio score of the two tokens
+    """
+    return fuzz.partial_ratio(token_a, token_b)
+
 def PIPE_Anchor_Reduction_UCID(entity_list: list, pipeline_locale: str):
     """Specialty disambiguation function that uses exceptions + anchors to map some entities to each other
     primarily by surname. The exceptions contain a few common typos that I solve for as well
@@ -665,81 +787,89 @@ def PIPE_Anchor_Reduction_UCID(entity_list: list, pipeline_locale: str):
     # print("\nPipe: Anchor Reduction within UCIDs")
 
     eligible_list = [o for o in entity_list if o.eligible]
+    n_eligible = len(eligible_list)
+    # 2-token names led by a botched prefix ("o connor", "j mathison")
+    prefixed = [len(o.base_tokens)==2 and o.base_tokens[0] in JG.anchor_prefixes for o in eligible_list]
+    # and the remainder of those names after the botched prefix
+    unprefixed_names = [" ".join(o.base_tokens[1:]) if prefixed[k] else None for k, o in enumerate(eligible_list)]
 
     # objs = entities on the docket
-    start = 0
-    # start with all entities
-    it_list = eligible_list[start:]
-    # while we are still comparing all entities
-    while it_list:
+    # walk the list by index so each pair is compared once: [A, B, C, D] --> AB, AC, AD, BC, BD, CD
+    for i in range(n_eligible):
         # pick current judge
-        this = eligible_list[start]
+        this = eligible_list[i]
+        # if this judge is not eligible to be mapped, move on
+        if not this.eligible:
+            continue
+        # bind the attributes used in the comparisons to locals once per entity
+        this_anchor = this.anchor
+        this_tokens = this.base_tokens
+        this_tl = this.token_length
+        this_tws = this.tokens_wo_suff
+        this_name = this.name
         # pick all other judges to compare to from the case, that havent been compared to it yet
-        those = eligible_list[start+1:]
-        
-        # iterate our counters up, and the next list to iterate after we complete here.
-        # the while loop exists when we go beyond the index length of the list
-        start+=1
-        it_list = eligible_list[start:]
-
-        # judges we will try to compare to
-        search = [o for o in those if o.eligible]
-        # if this judge is eligible to be mapped
-        if search and this.eligible:
-            for that in search: # for other judges on the case
-                # if either judge does not have an anchor, move on (if the entity surname was somehow not identifiable)
-                if not this.anchor or not that.anchor:
-                    continue
+        for j in range(i+1, n_eligible):
+            that = eligible_list[j]
+            # only judges still eligible get compared
+            if not that.eligible:
+                continue
+            that_anchor = that.anchor
+            that_tokens = that.base_tokens
+            that_tl = that.token_length
+            that_tws = that.tokens_wo_suff
+            that_name = that.name
+            # if either judge does not have an anchor, move on (if the entity surname was somehow not identifiable)
+            if not this_anchor or not that_anchor:
+                continue
 
-                # single letters are bad for this exercise, if the final anchor token was a single letter, move on
-                if len(this.anchor)==1 or len(that.anchor)==1:
+            # single letters are bad for this exercise, if the final anchor token was a single letter, move on
+            if len(this_anchor)==1 or len(that_anchor)==1:
+                continue
+
+            # checkwork begins, if the surname anchors are similar, or partially similar (identical ones trivially are)
+            if this_anchor == that_anchor or \
+                token_ratio(this_anchor, that_anchor)>=92 or \
+                token_partial_ratio(this_anchor, that_anchor)>=92:
+                # if we're doing a special check on single token names, make sure we're not getting coles in colemans
+                # TODO: there will be more names like this to account for
+                if len(this_tws)==1 or len(that_tws)==1:
+                    # if it is just surnames, ensure they are close enough in size that this is a typo
+                    # i.e. do not capture Cole in Coleman or Roberts in Robertson
+                    diff = len(this_anchor)-len(that_anchor)
+                    if diff >2 or diff <-2:
+                        continue
+                    # presumably good
+                    #otherwise they match
+                    this.choose_winner(that, f'Anchors-ucid-I [CB1]', pipeline_locale)
                     continue
 
-                # checkwork begins, if the surname anchors are similar, or partially similar
-                if fuzz.ratio(this.anchor, that.anchor)>=92 or fuzz.partial_ratio(this.anchor, that.anchor)>=92:
-                    # if we're doing a special check on single token names, make sure we're not getting coles in colemans
-                    # TODO: there will be more names like this to account for
-                    if len(this.tokens_wo_suff)==1 or len(that.tokens_wo_suff)==1:
-                        # if it is just surnames, ensure they are close enough in size that this is a typo
-                        # i.e. do not capture Cole in Coleman or Roberts in Robertson
-                        diff = len(this.anchor)-len(that.anchor)
-                        if diff >2 or diff <-2:
-                            continue
-                        # presumably good
-                        #otherwise they match
-                        this.choose_winner(that, f'Anchors-ucid-I [CB1]', pipeline_locale)
+                # o for o connor
+                # basically if they matched in fuzzy, and one name was "o connor" see if the other name is oconnor
+                # same deal with J Mathison and Mathison where the J stands for Judge 
+                # Mc Donald, Van Geulen
+                if prefixed[i]:
+                    # attempt the remainder of the name after the botched prefix
+                    if fuzz.partial_ratio(unprefixed_names[i], that_name, score_cutoff=92)>=92:
+                        this.choose_winner(that, f'Anchors-ucid-I [CB2]', pipeline_locale)
+                        continue
+                # flip logic on the other judge
+                if prefixed[j]:
+                    if fuzz.partial_ratio(this_name, unprefixed_names[j], score_cutoff=92)>=92:
+                        this.choose_winner(that, f'Anchors-ucid-I [CB3]', pipeline_locale)
                         continue
 
-                    # o for o connor
-                    # basically if they matched in fuzzy, and one name was "o connor" see if the other name is oconnor
-                    # same deal with J Mathison and Mathison where the J stands for Judge 
-                    # Mc Donald, Van Geulen
-                    possibilities=['jude','j','o', 'mc','van']
-                    if len(this.base_tokens)==2 and this.base_tokens[0] in possibilities:
-                        # attempt the remainder of the name after the botched prefix
-                        thisname = " ".join(this.base_tokens[1:])
-                        if fuzz.partial_ratio(thisname, that.name)>=92:
-                            this.choose_winner(that, f'Anchors-ucid-I [CB2]', pipeline_locale)
-                            continue
-                    # flip logic on the other judge
-                    if len(that.base_tokens)==2 and that.base_tokens[0] in possibilities:
-                        thatname = " ".join(that.base_tokens[1:])
-                        if fuzz.partial_ratio(this.name, thatname)>=92:
-                            this.choose_winner(that, f'Anchors-ucid-I [CB3]', pipeline_locale)
-                            continue
+                # if there is a mismatch in the first tokens confirm that it's not a partial name
+                # i.e. Amy j st eve matches st eves
+                if this_tl >=2 and that_tl >=2 and \
+                    len(this_tokens[0])>1 and \
+                    len(that_tokens[0])>1 and \
+                    this_tokens[0]!=that_tokens[0]:
 
-                    # if there is a mismatch in the first tokens confirm that it's not a partial name
-                    # i.e. Amy j st eve matches st eves
-                    if this.token_length >=2 and that.token_length >=2 and \
-                        len(this.base_tokens[0])>1 and \
-                        len(that.base_tokens[0])>1 and \
-                        this.base_tokens[0]!=that.base_tokens[0]:
+                    if fuzz.partial_ratio(this_name, that_name, score_cutoff=98)>=98:
+                        # presumably good (their similarity was above 98%)                                
+                        this.choose_winner(that, f'Anchors-ucid-I [CB4]', pipeline_locale)
+                        continue
 
-                        if fuzz.partial_ratio(this.name, that.name)>=98:
-                            # presumably good (their similarity was above 98%)                                
-                            this.choose_winner(that, f'Anchors-ucid-I [CB4]', pipeline_locale)
-                            continue
-    
     return entity_list
 
 def PIPE_Anchor_Reduction_II_UCID(entity_list: list, pipeline_locale: str):
@@ -756,65 +886,85 @@ def PIPE_Anchor_Reduction_II_UCID(entity_list: list, pipeline_locale: str):
     """
     # print("\nPipe: Anchor Reduction II within UCIDs")
     eligible_list = [o for o in entity_list if o.eligible]
-
-    start = 0
-    # start with all entities
-    it_list = eligible_list[start:]
-    # while we are still comparing all entities
-    while it_list:
-        this = eligible_list[start] # current judge
-        those = eligible_list[start+1:] # other judges to compare to
-
-        start+=1 # update iterables
-        it_list = eligible_list[start:] # update iterables
-
-        # eligible search for disambiguation
-        search = [o for o in those if o.eligible]
-        if search and this.eligible:
-            for that in search: # for other judges on the ucid
-                # if the surnames match at 90% or more
-                if fuzz.ratio(this.anchor, that.anchor)>=90:
-                    # anchors >90% and tokens all above 98%
-                    if fuzz.token_set_ratio(this.base_tokens, that.base_tokens) >=98:
-                        this.choose_winner(that,f"Anchors-ucid-II [CB1]", pipeline_locale)
+    n_eligible = len(eligible_list)
+
+    # lengths used to prefilter the fuzzy comparisons below
+    anchor_lens = [len(o.anchor) if o.anchor else 0 for o in eligible_list]
+    first_lens = [len(o.tokens_wo_suff[0]) for o in eligible_list]
+    last_lens = [len(o.tokens_wo_suff[-1]) for o in eligible_list]
+    # processed token sets (and processed lengths) used to gate the token set ratio below
+    processed_names = [o.processed_name for o in eligible_list]
+    token_sets = [frozenset(pn.split()) for pn in processed_names]
+    processed_lens = [len(pn) for pn in processed_names]
+
+    # compare every pair once: [A, B, C, D] --> AB, AC, AD, BC, BD, CD
+    for i in range(n_eligible):
+        this = eligible_list[i] # current judge
+        if not this.eligible:
+            continue
+        # bind the attributes used in the comparisons to locals once per entity
+        this_anchor = this.anchor
+        this_tokens = this.base_tokens
+        this_processed = processed_names[i]
+        this_token_set = token_sets[i]
+        this_tl = this.token_length
+        this_tws = this.tokens_wo_suff
+        for j in range(i+1, n_eligible): # for other judges on the ucid
+            that = eligible_list[j]
+            # eligible search for disambiguation
+            if not that.eligible:
+                continue
+            that_anchor = that.anchor
+            that_tl = that.token_length
+            that_tws = that.tokens_wo_suff
+            # if the surnames match at 90% or more (skipping the fuzz call when the lengths alone rule it out)
+            if fuzz_bound_reachable(anchor_lens[i], anchor_lens[j], 90) and token_ratio(this_anchor, that_anchor)>=90:
+                # anchors >90% and tokens all above 98% (token scorers get fuzzywuzzy's default processing)
+                # with no token in common the set ratio is a plain ratio of two differing strings, which can only
+                # reach 98 once the names total 50+ characters, so short disjoint names skip the scorer entirely
+                if (not this_token_set.isdisjoint(token_sets[j]) or processed_lens[i]+processed_lens[j]>=50) and \
+                    fuzz.token_set_ratio(this_processed, processed_names[j], score_cutoff=98) >=98:
+                    this.choose_winner(that,f"Anchors-ucid-II [CB1]", pipeline_locale)
+                    continue
+                # one of the entities was just a surname
+                if this_tl==1 and that_tl>1 or this_tl>1 and that_tl==1:
+                    this.choose_winner(that,f"Anchors-ucid-II [CB2]", pipeline_locale)
+                    continue
+            # if one is a surname and the other is 2 tokens
+            if this_tl==2:
+                if len(this_tokens[0])==1 or len(this_tokens[-1])==1:
+                    # try fuzing the 2-token name into one and see if there was a misc. letter
+                    # i.e. "Gelpi" vs. "Gelp i"
+                    this_alt_anchor = "".join(this_tokens)
+                    if fuzz.ratio(this_alt_anchor, that_anchor, score_cutoff=95)>=95:
+                        this.choose_winner(that,f"Anchors-ucid-II [CB3]", pipeline_locale)                            
                         continue
-                    # one of the entities was just a surname
-                    if this.token_length==1 and that.token_length>1 or this.token_length>1 and that.token_length==1:
-                        this.choose_winner(that,f"Anchors-ucid-II [CB2]", pipeline_locale)
+            # if both multitoken
+            if this_tl>=2 and that_tl>=2:
+                # if they are long names and the last tokens first letter doesnt match, fail out
+                if this_tl>=3 and that_tl>=3:
+                    if this_tws[1][0] != that_tws[1][0]:
                         continue
-                # if one is a surname and the other is 2 tokens
-                if this.token_length==2:
-                    if len(this.base_tokens[0])==1 or len(this.base_tokens[-1])==1:
-                        # try fuzing the 2-token name into one and see if there was a misc. letter
-                        # i.e. "Gelpi" vs. "Gelp i"
-                        this_alt_anchor = "".join(this.base_tokens)
-                        if fuzz.ratio(this_alt_anchor, that.anchor)>=95:
-                            this.choose_winner(that,f"Anchors-ucid-II [CB3]", pipeline_locale)                            
-                            continue
-                # if both multitoken
-                if this.token_length>=2 and that.token_length>=2:
-                    # if they are long names and the last tokens first letter doesnt match, fail out
-                    if this.token_length>=3 and that.token_length>=3:
-                        if this.tokens_wo_suff[1][0] != that.tokens_wo_suff[1][0]:
-                            continue
-                    # try comparing the first and last tokens individually in the names
-                    if fuzz.ratio(this.tokens_wo_suff[0],that.tokens_wo_suff[0])>=90 and \
-                        fuzz.ratio(this.tokens_wo_suff[-1],that.tokens_wo_suff[-1])>=90:
-                        # now ensure no disjointed middle initial
-                        # Karen J Williams and Karen M Williams
-                        if len(this.tokens_wo_suff)==3 and len(that.tokens_wo_suff)==3 \
-                            and this.tokens_wo_suff[1]!= that.tokens_wo_suff[1]:
-                            continue
-                        else:
-                            this.choose_winner(that,f"Anchors-ucid-II [CB4]", pipeline_locale)                            
-                            continue
-                # compare if the longer entity had dual last names and the short entity matched one of them
-                # basically: this = Smith Washington | that = Smith Washington Jones
-                if this.token_length==2 and that.token_length>2:
-                    if fuzz.ratio(this.tokens_wo_suff[0],that.tokens_wo_suff[-2])>=90 and \
-                        fuzz.ratio(this.tokens_wo_suff[1],that.tokens_wo_suff[-1])>=90:
-                        this.choose_winner(that,f"Anchors-ucid-II [CB5]", pipeline_locale)
+                # try comparing the first and last tokens individually in the names
+                if fuzz_bound_reachable(first_lens[i], first_lens[j], 90) and \
+                    fuzz_bound_reachable(last_lens[i], last_lens[j], 90) and \
+                    token_ratio(this.first_token,that.first_token)>=90 and \
+                    token_ratio(this_anchor,that_anchor)>=90:
+                    # now ensure no disjointed middle initial
+                    # Karen J Williams and Karen M Williams
+                    if len(this_tws)==3 and len(that_tws)==3 \
+                        and this_tws[1]!= that_tws[1]:
                         continue
+                    else:
+                        this.choose_winner(that,f"Anchors-ucid-II [CB4]", pipeline_locale)                            
+                        continue
+            # compare if the longer entity had dual last names and the short entity matched one of them
+            # basically: this = Smith Washington | that = Smith Washington Jones
+            if this_tl==2 and that_tl>2:
+                if token_ratio(this_tws[0],that_tws[-2])>=90 and \
+                    token_ratio(this_tws[1],that_tws[-1])>=90:
+                    this.choose_winner(that,f"Anchors-ucid-II [CB5]", pipeline_locale)
+                    continue
     return entity_list
 
 def PIPE_Anchor_Reduction_III_UCID(entity_list: list, pipeline_locale: str):
@@ -830,59 +980,74 @@ def PIPE_Anchor_Reduction_III_UCID(entity_list: list, pipeline_locale: str):
         list: the same list that entered, but the child objects in the lists may be updated and disambiguated
     """
     eligible_list = [o for o in entity_list if o.eligible]
-
-    start = 0
-    it_list = eligible_list[start:]
-    while it_list:
-        this = eligible_list[start] # object for comparison
-        those = eligible_list[start+1:] # list of other objects for comparison
-
-        start+=1 # update iterables
-        it_list = eligible_list[start:] # update iterables
-
-        # eligible to be matched
-        search = [o for o in those if o.eligible]
-        if search and this.eligible:
-            for that in search: # for all other judge names on the ucid we are comparing to
-                # running only for longer names
-                if this.token_length>=2:
-                    # against longer names
-                    if that.token_length>=2:
-                        # if the suffixless names match and the anchors (surnames match)
-                        if fuzz.ratio(this.tokens_wo_suff[0], that.tokens_wo_suff[0])>=90 and fuzz.ratio(this.tokens_wo_suff[-1], that.tokens_wo_suff[-1])>=90:
-                            # GOOD MATCH
-                            this.choose_winner(that, f"Anchors-ucid-III [CB1]", pipeline_locale)                                
-                            continue
-                        # if a mashed string form matches strongly, then it's probably misspelling or misc. letters junking up the match and its good
-                        if fuzz.ratio("".join(this.base_tokens), "".join(that.base_tokens))>=95:
-                            this.choose_winner(that, f"Anchors-ucid-III [CB2]", pipeline_locale)                                
-                            continue
-                    
-                    # if the first token is a letter and it's "j" assume it stands for judge, or jude stands for judge
-                    if (len(this.base_tokens[0])==1 and this.base_tokens[0]=='j') or this.base_tokens[0]=='jude':
-                        # assume this entity is a single surname then and attempt matching without the j or jude
-                        this_alt_anchor = this.base_tokens[1]
-                        if fuzz.ratio(this_alt_anchor, that.anchor)>=92:
-                            this.choose_winner(that, f"Anchors-ucid-III [CB3]", pipeline_locale)                                
-                            continue
+    n_eligible = len(eligible_list)
+
+    # mashed string forms of every entity name
+    flat_joins = ["".join(o.base_tokens) for o in eligible_list] # "johnsmith"
+    dot_joins = [".".join(o.base_tokens) for o in eligible_list] # "john.smith"
+    # lengths used to prefilter the first and last token comparisons below
+    first_lens = [len(o.tokens_wo_suff[0]) for o in eligible_list]
+    last_lens = [len(o.tokens_wo_suff[-1]) for o in eligible_list]
+
+    # compare every pair once: [A, B, C, D] --> AB, AC, AD, BC, BD, CD
+    for i in range(n_eligible):
+        this = eligible_list[i] # object for comparison
+        if not this.eligible:
+            continue
+        # bind the attributes used in the comparisons to locals once per entity
+        this_tokens = this.base_tokens
+        this_tl = this.token_length
+        this_tws = this.tokens_wo_suff
+        for j in range(i+1, n_eligible): # for all other judge names on the ucid we are comparing to
+            that = eligible_list[j]
+            # eligible to be matched
+            if not that.eligible:
+                continue
+            that_anchor = that.anchor
+            that_tl = that.token_length
+            that_tws = that.tokens_wo_suff
+            # running only for longer names
+            if this_tl>=2:
+                # against longer names
+                if that_tl>=2:
+                    # if the suffixless names match and the anchors (surnames match)
+                    # (skipping the fuzz calls when the token lengths alone rule a 90 out)
+                    if fuzz_bound_reachable(first_lens[i], first_lens[j], 90) and \
+                        fuzz_bound_reachable(last_lens[i], last_lens[j], 90) and \
+                        token_ratio(this.first_token, that.first_token)>=90 and token_ratio(this.anchor, that_anchor)>=90:
+                        # GOOD MATCH
+                        this.choose_winner(that, f"Anchors-ucid-III [CB1]", pipeline_locale)                                
+                        continue
+                    # if a mashed string form matches strongly, then it's probably misspelling or misc. letters junking up the match and its good
+                    if fuzz.ratio(flat_joins[i], flat_joins[j], score_cutoff=95)>=95:
+                        this.choose_winner(that, f"Anchors-ucid-III [CB2]", pipeline_locale)                                
+                        continue
+                
+                # if the first token is a letter and it's "j" assume it stands for judge, or jude stands for judge
+                if (len(this_tokens[0])==1 and this_tokens[0]=='j') or this_tokens[0]=='jude':
+                    # assume this entity is a single surname then and attempt matching without the j or jude
+                    this_alt_anchor = this_tokens[1]
+                    if fuzz.ratio(this_alt_anchor, that_anchor, score_cutoff=92)>=92:
+                        this.choose_winner(that, f"Anchors-ucid-III [CB3]", pipeline_locale)                                
+                        continue
+                
+                # mashed string forms of the entity names
+                thisjoin = dot_joins[i]
+                thatjoin = dot_joins[j]
+                # if the smashed forms have a decent match
+                if thisjoin in thatjoin or thatjoin in thisjoin or fuzz.ratio(thisjoin, thatjoin, score_cutoff=92)>=92:
+                    # they need to be longer than 3 letters (initials not considered here like CJR)
+                    if len(flat_joins[i])<=3 or len(flat_joins[j])<=3:
+                        # bad match
+                        continue
+                    # single token names from headers are usually just initials and cannot confidently be handled here
+                    if (this_tl ==1 and this.was_header) or (that_tl ==1 and that.was_header):
+                        #bad match
+                        continue
                     
-                    # mashed string forms of the entity names
-                    thisjoin = ".".join(this.base_tokens)
-                    thatjoin = ".".join(that.base_tokens)
-                    # if the smashed forms have a decent match
-                    if thisjoin in thatjoin or thatjoin in thisjoin or fuzz.ratio(thisjoin, thatjoin)>=92:
-                        # they need to be longer than 3 letters (initials not considered here like CJR)
-                        if len("".join(this.base_tokens))<=3 or len("".join(that.base_tokens))<=3:
-                            # bad match
-                            continue
-                        # single token names from headers are usually just initials and cannot confidently be handled here
-                        if (this.token_length ==1 and this.was_header) or (that.token_length ==1 and that.was_header):
-                            #bad match
-                            continue
+                    # if we didnt fail out, then the mashed names worked and we say they match
+                    this.choose_winner(that, f"Anchors-ucid-III [CB4]", pipeline_locale)
                         
-                        # if we didnt fail out, then the mashed names worked and we say they match
-                        this.choose_winner(that, f"Anchors-ucid-III [CB4]", pipeline_locale)
-                            
     return entity_list
 
 def PIPE_Anchor_Reduction_Court(court_long: list, court_short: list, court: str):
@@ -900,19 +1065,39 @@ def PIPE_Anchor_Reduction_Court(court_long: list, court_short: list, court: str)
     # only check what is eligible at this point
     longs = [o for o in court_long if o.eligible]
     singles = [o for o in court_short if o.eligible]
+    # possessive forms of the surnames ("smith" --> "smiths")
+    long_possessives = [f"{l.anchor}s" for l in longs]
+
+    # every check below is an exact equality on a key of the long name (its surname, its possessive surname,
+    # or its surname's letter signature), so index the long names by those keys once. Each single name then
+    # only visits the long names it could match
+    by_anchor = defaultdict(list)
+    by_possessive = defaultdict(list)
+    by_signature = defaultdict(list)
+    for position, l in enumerate(longs):
+        by_anchor[l.anchor].append(position)
+        by_possessive[long_possessives[position]].append(position)
+        by_signature[l.anchor_signature].append(position)
 
     # for every uni-token entity
     for each in singles:
         # init matching nothing
         matches = []
-        # compare to every long name
-        for l in longs:
+        each_possessive = f"{each.anchor}s"
+        # candidate long names, walked in their original order
+        candidates = sorted(set(by_possessive.get(each.anchor, [])).union(
+            by_anchor.get(each_possessive, []), by_signature.get(each.name_signature, [])))
+        # compare to every candidate long name
+        for position in candidates:
+            l = longs[position]
+            l_possessive = long_possessives[position]
             # possessive quickcheck:
-            if each.anchor == f"{l.anchor}s" or l.anchor == f"{each.anchor}s":
+            if each.anchor == l_possessive or l.anchor == each_possessive:
                 matches.append(l)
         
             # if the characters are slightly typoed, this catches them
-            elif fuzz.ratio(each.name, l.anchor)>=80 and Counter(each.name) == Counter(l.anchor):
+            # the precomputed anagram signatures are compared first, they rule out nearly every pair without a fuzz call
+            elif each.name_signature == l.anchor_signature and fuzz.ratio(each.name, l.anchor, score_cutoff=80)>=80:
                 matches.append(l)
         
         # if matches were found, confirm there were no ambiguous surname mappings
@@ -945,34 +1130,46 @@ def PIPE_Fuzzy_Matching(entity_list: list, pipeline_locale: str):
     # print("\nPipe: Fuzzy Matching")
     
     eligible_list = [o for o in entity_list if o.eligible]
+    n_eligible = len(eligible_list)
+    # eligibility flags mirrored into a boolean mask, only the compared pair can change on a reduction
+    alive = np.ones(n_eligible, dtype=bool)
+    names = [o.name for o in eligible_list]
+    n_ucids = [o.n_ucids for o in eligible_list]
 
-    start = 0 # iterables
-    it_list = eligible_list[start:] # iterables
     # comparison is bidirectional such that A compared to B is equivalent to B compared to A
     # when we enumerate out the list of comparisons it is effectively like: [A, B, C, D]
     # --> AB, AC, AD, BC, BD, CD
-    while it_list: # go until we reach the end of the list
-        this = eligible_list[start] # entity to compare
-        those = eligible_list[start+1:] # other entities we compare to
-        start+=1 # iterables
-        it_list = eligible_list[start:] # the next loop
-
-        # only want eligible entities. Eligible means another entity can point to it and be disambiguated to it and this entity does not point elsewhere
-        search = [o for o in those if o.eligible]
-        if search: # if there are eligible ones
-            for that in search:
+    # the names are scored a block of rows at a time against themselves and every later name. The bound below is 93 or 90
+    # depending on the pair, so keep anything that could reach 90. Scores come back rounded to whole numbers (off by at most
+    # half a point), so a rounded score above the bound clears it, one below it fails, and only a score landing exactly
+    # on the bound needs the exact ratio (no extra workers, this already runs inside the ucid/court process pools)
+    block = 256
+    for start in range(0, n_eligible, block):
+        stop = min(start+block, n_eligible)
+        scores = process.cdist(names[start:stop], names[start:], scorer=fuzz.ratio, score_cutoff=89, dtype=np.uint8)
+        for i in range(start, stop): # go until we reach the end of the list
+            this = eligible_list[i] # entity to compare
+            row = scores[i-start, i+1-start:]
+            # only want eligible entities. Eligible means another entity can point to it and be disambiguated to it and this entity does not point elsewhere
+            # a reduction only touches this entity and the one it was compared to, so the later entities still alive
+            # at the start of the row stay alive until the walk reaches them: mask them together with the scores in one step
+            candidates = np.flatnonzero((row >= 90) & alive[i+1:])
+            for j, score in zip((candidates + i+1).tolist(), row[candidates].tolist()): # other entities we compare to
                 # if each entity appeared on more than 20 ucids OR
                 # one of the entities appeared much more frequently than the other
                 # loosen the bound a bit, more common occurrences == more leeway for typos
                 bound = 93
-                if this.n_ucids and that.n_ucids:
-                    if (this.n_ucids/that.n_ucids)>20 or (that.n_ucids/this.n_ucids)>20:
-                        bound = 90  
+                if n_ucids[i] and n_ucids[j]:
+                    if (n_ucids[i]/n_ucids[j])>20 or (n_ucids[j]/n_ucids[i])>20:
+                        bound = 90
 
-                # if they fuzzy matched, hooray
-                if fuzz.ratio(this.name, that.name) >=bound:
+                # if they fuzzy matched, hooray (a score landing on the bound gets the exact ratio)
+                if score > bound or (score == bound and fuzz.ratio(names[i], names[j], score_cutoff=bound) >=bound):
+                    that = eligible_list[j]
                     # object routine to reduce the objects with each other
                     this.choose_winner(that, "UCIDFuzzy", pipeline_locale)
+                    alive[i] = this.eligible
+                    alive[j] = that.eligible
 
     return entity_list
 
@@ -993,25 +1190,11 @@ def UCID_PIPE_Drop_Parties(ucid_map: dict, parties_df: pd.DataFrame, counsels_df
         dict, dict: one dictionary is the one containing the entities we want to advance to disambiguation, the other is a log of which entities we threw out
     """
     
-    def _check_if_party(entity_obj: JCL.UCIDMatch, party_names: list):
-        """helper function to compare if an entity object is in a list of party names by fuzzy matching
-
-        Args:
-            entity_obj (obj): IntraMatch UCID Object
-            party_names (list): list of party name strings on the case
-
-        Returns:
-            bool: is it a match to a party name or not
-        """
-        # check against every party in the case
-        for party in party_names:
-            # if the object matches strongly, return True
-            if fuzz.ratio(str(entity_obj.name), str(party))>95:
-                return True
-        # if we got through every party and none of the entities flagged, return false and proceed to disambiguation with this one
-        return False
-    
     print("\nPipe: Party and Counsel Dropping Running")
+    # the strings are unique within each frame, but the same names show up as both parties and counsels
+    # (pro se parties for one), so the cleaning is memoized across the two frames for this run
+    clean = lru_cache(maxsize=1<<16)(JCF.stacked_cleaning)
+
     print(">> Cleaning party names")
 
     # drop null or blank string entities
@@ -1020,15 +1203,15 @@ def UCID_PIPE_Drop_Parties(ucid_map: dict, parties_df: pd.DataFrame, counsels_df
     parties_unique = list(parties_df.Entity.unique())
 
     # get them into a cleaned form as parties
-    pmap = {party: JCF.stacked_cleaning(str(party)) for party in parties_unique}
+    pmap = {party: clean(str(party)) for party in parties_unique}
     # if the cleaning resulted in a string longer than nothing, we will map it back to the original party name
     pmap = {k:v for k,v in pmap.items() if v}
     # map it
     parties_df['CLEANED_ENT'] = parties_df.Entity.map(pmap)
 
-    # now convert the parties df into a dict, keyed by ucid
+    # now convert the parties df into a dict, keyed by ucid (zipping the columns, no intermediate row tuples)
     party_maps = defaultdict(list)
-    for ucid, party in tqdm.tqdm([tuple(x) for x in parties_df[['ucid','CLEANED_ENT']].to_numpy()]):
+    for ucid, party in zip(parties_df['ucid'].tolist(), parties_df['CLEANED_ENT'].tolist()):
         party_maps[ucid].append(party)
 
     print(">> Cleaning counsel names")
@@ -1037,19 +1220,23 @@ def UCID_PIPE_Drop_Parties(ucid_map: dict, parties_df: pd.DataFrame, counsels_df
     # take the unique ones
     counsels_unique = list(counsels_df.Entity.unique())
     # clean their names
-    cmap = {counsel: str(JCF.stacked_cleaning(str(counsel))) for counsel in counsels_unique}
+    cmap = {counsel: str(clean(str(counsel))) for counsel in counsels_unique}
     # if the cleaned name is not an empty string, we will map it
     cmap = {k:v for k,v in cmap.items() if v}
     # map it back to the counsels df
     counsels_df['CLEANED_ENT'] = counsels_df.Entity.map(cmap)
 
-    # now convert the counsels df into a dict, keyed by ucid
-    counsel_maps = defaultdict(list)
-    for ucid, counsel in tqdm.tqdm([tuple(x) for x in counsels_df[['ucid','CLEANED_ENT']].to_numpy()]):
-        counsel_maps[ucid].append(counsel)
+    # now combine both parties and counsels into one "parties" dict keyed by ucid: the counsels go straight onto the
+    # end of their case's party list (only the cases that had parties are kept), no separate counsel dict or list copies
+    for ucid, counsel in zip(counsels_df['ucid'].tolist(), counsels_df['CLEANED_ENT'].tolist()):
+        case_parties = party_maps.get(ucid)
+        if case_parties is not None:
+            case_parties.append(counsel)
+    parties = party_maps
     
-    # now combine both parties and counsels into one "parties" dict keyed by ucid
-    parties = {ucid: party_maps[ucid] + counsel_maps[ucid] for ucid in party_maps.keys()}
+    # the cleaning cache is not needed past this point
+    clean.cache_clear()
+
     print(">> Now dropping parties and counsels")
 
     # now run thru each ucid and drop any entities that match parties for the case
@@ -1066,10 +1253,24 @@ def UCID_PIPE_Drop_Parties(ucid_map: dict, parties_df: pd.DataFrame, counsels_df
         # we compare the entities that appeared only on this ucid (that is a single occurence in our dataset)
         # (efficiency choice -- seems obvious if an entity appears on 100 ucids, it's not a party 99% of the time)
         compy = [e for e in entities if e.n_ucids==1]
-        # anybody that fails the party check is a tosser
-        tossers = [each for each in compy if _check_if_party(each, case_parties)]
-        # keepers arent tossers
-        keepers = [e for e in entities if e not in tossers]
+        # with nobody to check, nobody gets tossed -- skip building the score matrix
+        if not compy:
+            new_map[ucid] = list(entities)
+            toss_map[ucid] = []
+            continue
+        # anybody that matches a party or counsel name strongly (ratio > 95) is a tosser
+        # score the entities against every party on the case in a single call
+        party_scores = process.cdist([str(each.name) for each in compy], [str(party) for party in case_parties],
+                                     scorer=fuzz.ratio, score_cutoff=95, dtype=np.float64)
+        matched = iter((party_scores>95).any(axis=1).tolist())
+        # keepers arent tossers, split them in one pass over the entities (the checked ones come up in the same order they were scored)
+        tossers = []
+        keepers = []
+        for e in entities:
+            if e.n_ucids==1 and next(matched):
+                tossers.append(e)
+            else:
+                keepers.append(e)
         # map them
         new_map[ucid] = keepers
         toss_map[ucid] = tossers
@@ -1083,51 +1284,88 @@ def UCID_PIPE_Drop_Parties(ucid_map: dict, parties_df: pd.DataFrame, counsels_df
 ############################################
 ## Tokens in Tokens Application Functions ##
 ############################################
-def pool_runner(this_pool: list, that_pool: list):
+@lru_cache(maxsize=2**16)
+def pool_runner(this_pool: tuple, that_pool: tuple):
     """Helper function that takes in 2 lists of tokens (pools) and compares them against each other using 
-    my custom tokens in tokens subroutine
+    my custom tokens in tokens subroutine. Pools are tuples, so verdicts are cached -- the same pair of pools
+    comes back across the style and abbreviation runs whenever a style leaves a name's pool unchanged
     example: Name Christian John Michael Rozolis and Chris John M Rozolis
     - A: [[Christian J M Rozolis],[Christian John M Rozolis],[Christian J Michael Rozolis]]
     - B: [[Chris John M Rozolis],[Chris J M Rozolis]]
     compare the combinations of A lists to B lists
 
     Args:
-        this_pool (list): lists of token variations of entity name a
-        that_pool (list): lists of token variations of entity name b
+        this_pool (tuple): tuples of token variations of entity name a
+        that_pool (tuple): tuples of token variations of entity name b
 
     Returns:
         bool: is one of these token sublists a subset of the other
     """
+    # when one of the sublists is a single token and the other is multi, the only check is if the lone token
+    # is the surname (anchor) of the multi-token sublist. Gather those for each pool
+    # note these are strings and not the actual objects themselves
+    this_singles, this_surnames = pool_singles_and_surnames(this_pool)
+    that_singles, that_surnames = pool_singles_and_surnames(that_pool)
+
+    # if the surnames match in either direction, its good
+    if not this_singles.isdisjoint(that_surnames) or not that_singles.isdisjoint(this_surnames):
+        return True
+
     # for each sublist of tokens in the pools
     for tokey_a in this_pool:
+        len_a = len(tokey_a)
         for tokey_b in that_pool:
-            # if one of the sublists is a single token and the other is multi
-            if len(tokey_a)==1 and len(tokey_b)>1:
-                # anchor a (surname)
-                ta = tokey_a[0]
-                # anchor b (surname)
-                # note these are strings and not the actual objects themselves
-                tbL = tokey_b[-2] if tokey_b[-1] in JG.suffixes_titles else tokey_b[-1]     
-                # if the surnames dont match, move on fast
-                if ta!=tbL:
-                    continue  
-                else:
-                    # if the surnames match, its good
-                    return True
-            # vice versa
-            if len(tokey_b)==1 and len(tokey_a)>1:
-                tb = tokey_b[0]
-                taL = tokey_a[-2] if tokey_a[-1] in JG.suffixes_titles else tokey_a[-1]
-                if tb!=taL:
-                    continue   
-                else:
-                    # if the surnames match, its good
-                    return True
+            len_b = len(tokey_b)
+            # single vs. multi-token sublists only ever match on surname, and that was settled above. move on fast
+            if (len_a==1 and len_b>1) or (len_b==1 and len_a>1):
+                continue
             # if you made it here, call the sub function
             if tokens_in_tokens_sub_function_caller(tokey_a, tokey_b):
                 return True
     return False
     
+@lru_cache(maxsize=2**14)
+def pool_singles_and_surnames(pool: tuple):
+    """Split a pool into its lone tokens and the surnames of its multi-token sublists. The same pools are run
+    against many other pools, so this is cached rather than rebuilt per pair
+
+    Args:
+        pool (tuple): tuple of token tuples for one entity name
+
+    Returns:
+        frozenset, frozenset: the single-token sublists' tokens, the multi-token sublists' surnames
+    """
+    # local binding for the suffix membership checks below
+    suffix_set = JG.suffixes_titles_set
+    singles = frozenset(tokey[0] for tokey in pool if len(tokey)==1)
+    surnames = frozenset(tokey[-2] if tokey[-1] in suffix_set else tokey[-1] for tokey in pool if len(tokey)>1)
+    return singles, surnames
+
+# the node attribute holding the prebuilt token pools for each tokens in tokens style
+# (the nicknames pools combine base tokens and nicknames, since each needs comparing against the other)
+POOL_STYLE_ATTRIBUTES = {'Plain': 'inferred_tokens',
+                         'Unified': 'unified_names_tokens',
+                         'Nicknames': 'nickname_pool_tokens'}
+
+def node_pool(node: JCL.IntraMatch, abbreviated_first: bool, abbreviated_middle: bool, style: str):
+    """Given one entity, and abbreviation and style arguments, grab its pool of tokens for a tokens in tokens check.
+    The pools are prebuilt on the nodes, so the pipelines look each node's pool up once per run rather than once per pair
+
+    Args:
+        node (obj): IntraMatch child object that will have certain attributes related to its name
+        abbreviated_first (bool): should we abbreviate the first token
+        abbreviated_middle (bool): should we abbreviate the middle token[s]
+        style (str): plaintext argument for type of entity names to be used (normal, nicknames, or universal spellings)
+
+    Returns:
+        tuple: tuple of token tuples containing the appropriate abbreviation, and style settings
+    """
+    attribute = POOL_STYLE_ATTRIBUTES.get(style)
+    if not attribute:
+        # you gave a bad argument, sorry
+        return ()
+    return getattr(node, attribute)[abbreviated_first][abbreviated_middle]
+
 def pool_creator(this: JCL.IntraMatch, that: JCL.IntraMatch, abbreviated_first: bool, abbreviated_middle: bool, style: str):
     """Given 2 entities, and abbreviation and style arguments, create the pools of tokens necessary for a tokens in tokens check to be run.
     Examples of the pools for a middle initial = True
@@ -1142,24 +1380,51 @@ def pool_creator(this: JCL.IntraMatch, that: JCL.IntraMatch, abbreviated_first:
         style (str): plaintext argument for type of entity names to be used (normal, nicknames, or universal spellings)
 
     Returns:
-        list, list: returns lists of lists for each pool containing the appropriate abbreviation, and style settings
+        tuple, tuple: returns tuples of token tuples for each pool containing the appropriate abbreviation, and style settings
     """
-    if style =='Plain':
-        this_pool = this.inferred_tokens[abbreviated_first][abbreviated_middle]
-        that_pool = that.inferred_tokens[abbreviated_first][abbreviated_middle]
-    elif style == 'Unified':
-        this_pool = this.unified_names_tokens[abbreviated_first][abbreviated_middle]
-        that_pool = that.unified_names_tokens[abbreviated_first][abbreviated_middle]
-    elif style == 'Nicknames':
-        # this_pool = this.nicknames_tokens[abbreviated_first][abbreviated_middle]
-        # we need to compare base tokens to nicknames and vice versa, so both get included in the pools
-        this_pool = this.inferred_tokens[abbreviated_first][abbreviated_middle] + this.nicknames_tokens[abbreviated_first][abbreviated_middle]
-        that_pool = that.nicknames_tokens[abbreviated_first][abbreviated_middle] + that.inferred_tokens[abbreviated_first][abbreviated_middle]
-    else:
-        # you gave a bad argument, sorry
-        return [],[]
-    
-    return this_pool, that_pool
+    return (node_pool(this, abbreviated_first, abbreviated_middle, style),
+            node_pool(that, abbreviated_first, abbreviated_middle, style))
+
+def pool_block_index(pools: list):
+    """Blocking index for the tokens in tokens pipes. A token sublist can only sit inside another one if the other
+    has all of its tokens, in particular its longest token (its "key"). So two pools can only match if one pool's
+    tokens contain a key token of the other pool (a lone token matching a surname is the same test, it is its own key)
+
+    Args:
+        pools (list): token pools (tuples of token tuples), one per entity in the list being compared
+
+    Returns:
+        tuple: per position token sets and key sets, then token --> positions with it anywhere in their pool,
+            and token --> positions with it as a sublist key
+    """
+    pool_tokens = [{tok for tokey in pool for tok in tokey} for pool in pools]
+    pool_keys = [{max(tokey, key=len) for tokey in pool if tokey} for pool in pools]
+    by_token = defaultdict(list)
+    by_key = defaultdict(list)
+    for position in range(len(pools)):
+        for tok in pool_tokens[position]:
+            by_token[tok].append(position)
+        for tok in pool_keys[position]:
+            by_key[tok].append(position)
+    return pool_tokens, pool_keys, by_token, by_key
+
+def later_pool_candidates(block_index: tuple, position: int):
+    """Given a pool blocking index, find the later positions whose pools could match the pool at this position
+
+    Args:
+        block_index (tuple): output of pool_block_index for the list being compared
+        position (int): position of the entity in the list
+
+    Returns:
+        list: ascending positions after this one that share a key token with it in either direction
+    """
+    pool_tokens, pool_keys, by_token, by_key = block_index
+    candidates = set()
+    for tok in pool_keys[position]:
+        candidates.update(by_token[tok])
+    for tok in pool_tokens[position]:
+        candidates.update(by_key.get(tok, []))
+    return sorted(j for j in candidates if j > position)
 
 #------------#
 # UCID/COURT #
@@ -1187,27 +1452,30 @@ def PIPE_Tokens_in_Tokens(entity_list: list, pipeline_locale: str,
 
     # for every ucid or court
     eligible_list = [o for o in entity_list if o.eligible]
-
-    start = 0 # iterables
-    it_list = eligible_list[start:] # iterables
-    while it_list:
-        this = eligible_list[start] # object to compare
-        those = eligible_list[start+1:] # other objects to compare to
-        
-        start+=1 # iterables
-        it_list = eligible_list[start:] # iterables
-
-        # only want eligible objects
-        search = [o for o in those if o.eligible]
-        if search:
-            # for every object eligible to be compared
-            for that in search:
-                # create the pools of tokens
-                this_pool, that_pool = pool_creator(this, that, abbreviated_first, abbreviated_middle, style)
-                # run the pools through the tokens in tokens check
-                if pool_runner(this_pool, that_pool):
-                    # if they match, reduce them
-                    this.choose_winner(that, f'TIT-{int(abbreviated_first)}{int(abbreviated_middle)}-{style}', pipeline_locale)
+    n_eligible = len(eligible_list)
+
+    # blocking: only walk the pairs whose pools could possibly match (see pool_block_index)
+    pools = [node_pool(o, abbreviated_first, abbreviated_middle, style) for o in eligible_list]
+    block_index = pool_block_index(pools)
+    # eligibility flags mirrored into a byte array, only the compared pair can change on a reduction
+    alive = bytearray(b'\x01'*n_eligible)
+
+    # index based triangular walk over the blocked candidates, in the same order as the full pairwise walk
+    # (this object is compared even if it was absorbed earlier in its own row)
+    for i in range(n_eligible):
+        this = eligible_list[i] # object to compare
+        # for every object eligible to be compared
+        for j in later_pool_candidates(block_index, i):
+            # only want eligible objects
+            if not alive[j]:
+                continue
+            that = eligible_list[j]
+            # run the (prebuilt) pools of tokens through the tokens in tokens check
+            if pool_runner(pools[i], pools[j]):
+                # if they match, reduce them
+                this.choose_winner(that, f'TIT-{int(abbreviated_first)}{int(abbreviated_middle)}-{style}', pipeline_locale)
+                alive[i] = this.eligible
+                alive[j] = that.eligible
 
     return entity_list
 
@@ -1242,10 +1510,17 @@ def PIPE_UCID_COURT_INITIALISMS(entity_list_long: list, court: str):
             len(each.base_tokens[0])>2 and \
             len(each.base_tokens[1])==1:
             matchy.append(each)
+
+    # both styles below need the first names to match exactly, so bucket the long names by first token once
+    long_names = defaultdict(list)
+    for o in entity_list_long:
+        if o.token_length>=3:
+            long_names[o.base_tokens[0]].append(o)
+
     # for all eligible to be matched
     for m in matchy:
-        # compare against all long names
-        for n in [o for o in entity_list_long if o.eligible and o!=m and o.token_length>=3]:
+        # compare against all long names sharing the first name
+        for n in [o for o in long_names.get(m.base_tokens[0], []) if o.eligible and o!=m]:
             # if the first letters match across the board and the first names match
             if n.base_tokens[0] == m.base_tokens[0] and \
                 n.base_tokens[1][0] == m.base_tokens[1][0] and\
@@ -1277,28 +1552,53 @@ def PIPE_COURT_Anchors_Self_Reduction(entity_list_short: list, court: str):
     """
     # only consider those entities that remained eligible upon entering this function
     eligible_list = [o for o in entity_list_short if o.eligible]
-    
-    start = 0 # iterables
-    it_list = eligible_list[start:] # iterables
-    while it_list:
-        this = eligible_list[start] # object to compare
-        those = eligible_list[start+1:] # other objects to compare to
-        
-        start+=1 # iterables
-        it_list = eligible_list[start:] # iterables
-
+    n_eligible = len(eligible_list)
+
+    # candidate partners per entity, every pair that could pass either check below
+    candidates = defaultdict(set)
+    # score all the names against each other in one vectorized call, anything under 79 comes back 0
+    # (1 point of slack for the uint8 rounding, the exact ratio is rechecked in the loop)
+    # (no extra workers, this already runs inside the court process pool)
+    names = [o.name for o in eligible_list]
+    scores = process.cdist(names, names, scorer=fuzz.ratio, score_cutoff=79, dtype=np.uint8)
+    for i, j in zip(*scores.nonzero()):
+        if i < j:
+            candidates[i].add(j)
+    # possessive pairs, looked up by anchor
+    # possessive forms of the surnames ("smith" --> "smiths")
+    possessives = [f"{o.anchor}s" for o in eligible_list]
+    by_anchor = defaultdict(list)
+    by_possessive = defaultdict(list)
+    for position, o in enumerate(eligible_list):
+        if o.anchor:
+            by_anchor[o.anchor].append(position)
+        by_possessive[possessives[position]].append(position)
+    for i, o in enumerate(eligible_list):
+        for j in by_possessive.get(o.anchor, []) + by_anchor.get(possessives[i], []):
+            if i < j:
+                candidates[i].add(j)
+
+    # walk the candidates in the same order the full pairwise loop would have
+    for i in range(n_eligible):
+        this = eligible_list[i] # object to compare
+        if not this.eligible or i not in candidates:
+            continue
         # only want eligible objects
-        search = [o for o in those if o.eligible]
-        if search and this.eligible:
-            for that in search:
-                # possessive quickcheck:
-                if this.anchor == f"{that.anchor}s" or that.anchor == f"{this.anchor}s":
-                    this.choose_winner(that, f'Anchor Self-Reduction in Court Matching', court)
-                
-                # surnames have lower threshold as they are single tokens
-                if fuzz.ratio(this.name, that.name)>80 and Counter(this.name) == Counter(that.name):
-                    this.choose_winner(that, f'Anchor Self-Reduction in Court Matching', court)
-        
+        search = [j for j in sorted(candidates[i]) if eligible_list[j].eligible]
+        for j in search:
+            that = eligible_list[j]
+            # possessive quickcheck:
+            if this.anchor == possessives[j] or that.anchor == possessives[i]:
+                this.choose_winner(that, f'Anchor Self-Reduction in Court Matching', court)
+
+            # surnames have lower threshold as they are single tokens
+            # the letter count check is the cheap rejection so it runs first, the ratio stops early below 80
+            # (equal sorted-character signatures are exactly equal letter counts)
+            # a rounded score of 82 or more is already past 80 even if it was rounded up, so only the closer calls rerun the ratio
+            if this.name_signature == that.name_signature and (
+                scores[i, j] >= 82 or fuzz.ratio(this.name, that.name, score_cutoff=80)>80):
+                this.choose_winner(that, f'Anchor Self-Reduction in Court Matching', court)
+
     return entity_list_short
 
 
@@ -1307,72 +1607,91 @@ def PIPE_COURT_Anchors_Self_Reduction(entity_list_short: list, court: str):
 # Helper that calls the tokens in tokens check in both 
 # directions for lists (list a in b or list b in a)
 #########################################################
-def tokens_in_tokens_sub_function_caller(tokens_a: list, tokens_b: list):
-    """helper function to run through the tokens in tokens checker
+@lru_cache(maxsize=2**16)
+def tokens_in_tokens_sub_function_caller(tokens_a: tuple, tokens_b: tuple):
+    """helper function to run through the tokens in tokens checker. The pools hand over the same token
+    tuples again and again across entity pairs (common surnames, initialed forms), so the verdicts are cached
 
     Args:
-        tokens_a (list): list of name a's tokens
-        tokens_b (list): list of name b's tokens
+        tokens_a (tuple): tuple of name a's tokens
+        tokens_b (tuple): tuple of name b's tokens
 
     Returns:
         bool: are a's tokens wholly in list b or are b's tokens wholly in list a
     """
-    if tokens_a ==[] or tokens_b == []:
+    # empty token sets (lists or tuples) never match
+    if not tokens_a or not tokens_b:
         return False
 
+    # a list can only be wholly present in another list that is at least as long,
+    # so only run the direction(s) the token counts allow
+    len_a = len(tokens_a)
+    len_b = len(tokens_b)
+    # it also needs every distinct token to show up in the other list, a C level subset test on the
+    # (cached) position map keys throws out most pairs before the order and count logic runs
+    keys_a = token_positions(tokens_a).keys()
+    keys_b = token_positions(tokens_b).keys()
+
     # if a in b, great return
-    if tokens_in_tokens_sub_function(tokens_a, tokens_b):
-        
+    if len_a <= len_b and keys_a <= keys_b and tokens_in_tokens_sub_function(tokens_a, tokens_b):
         return True
     # else, try the reverse
-    elif tokens_in_tokens_sub_function(tokens_b, tokens_a):
+    elif len_b <= len_a and keys_b <= keys_a and tokens_in_tokens_sub_function(tokens_b, tokens_a):
         return True
     # else, false
     else:
         return False
 
 
-def tokens_in_tokens_sub_function(tokens_1: list, tokens_2: list):
+@lru_cache(maxsize=2**14)
+def token_positions(tokens: tuple):
+    """Index a token tuple by token, cached since the same pool tuples are checked over and over
+
+    Args:
+        tokens (tuple): pre-split name tokens
+
+    Returns:
+        dict: key = token, value = tuple of the positions the token appears at (its count is the tuple length)
+    """
+    positions = defaultdict(list)
+    for i, token in enumerate(tokens):
+        positions[token].append(i)
+    return {token: tuple(inds) for token, inds in positions.items()}
+
+def tokens_in_tokens_sub_function(tokens_1: tuple, tokens_2: tuple):
     """ This is the sub-function that will token-wise compare 2 lists and determine if list_1
     is wholly present in list_2. Note sets() and Counters() cannot be compared since we need to account for
     dual names appearing i.e. [jo, jo, smith] or [george, h, george] and account for their order of appearance
 
     Args:
-        tokens_1 (list): pre-split name into list of token strings for one name
-        tokens_2 (list): pre-split name into list of token strings to check if list_1 is present
+        tokens_1 (tuple): pre-split name into tuple of token strings for one name
+        tokens_2 (tuple): pre-split name into tuple of token strings to check if list_1 is present
 
     Returns:
         bool: a bool indicating if one of these token lists is wholly present in the other
     """
     
-    # determine if every token in the first list appears in the second lists elements              
-    if all(token in tokens_2 for token in tokens_1):
+    # cached token --> positions maps for both lists (these double as the token counts)
+    positions_1 = token_positions(tokens_1)
+    positions_2 = token_positions(tokens_2)
+
+    # determine if every token in the first list appears in the second lists elements
+    # (a subset test on the dict key views)
+    if positions_1.keys() <= positions_2.keys():
         # SPECIAL CASE 1.
         # the george h. george catch -- if a token appears twice in the list_1, the check above doesnt
         # confirm it appears twice in the second list, just that it appeared in the second list.
         # Thus both george tokens in george h george do both technically appear in george h washington
         # we must confirm via counts that there is in fact a double george in the second name
         # or else we say "actually -- no match"
-        # init a tracker
-        tracker = []
-        # for every token in list 1 that appears more than once (counter comprehension here)
-        # if there are no double tokens, we move right along
-        count_1 = Counter(tokens_1)
-        count_2 = Counter(tokens_2)
-        for tok, count in {k:v for k,v in count_1.items() if v>1}.items():
-            # if the count of that token in list 2 is less than the count in list 1
-            # then we know this can't be right (2 georges compared to 1)
-            if count_2[tok] < count:
-                # this token fails so note it as false
-                tracker.append(False)
-                break # fail early
-            else:
-                # else note this token as true, check next tokens
-                tracker.append(True)
-
-        # if any of the tokens returned false, this mismatches and kicks out a failure on the sub-function
-        # the failure meaning list_1 is not wholly present in list_2
-        if sum(tracker) != len(tracker):
+        # for every token in list 1 that appears more than once (read straight off the cached positions,
+        # no count dict or tracker list built per call), if there are no double tokens, we move right along
+        # if the count of that token in list 2 is less than the count in list 1
+        # then we know this can't be right (2 georges compared to 1)
+        # this mismatches and kicks out a failure on the sub-function, the failure meaning list_1 is not wholly present in list_2
+        # (most names have no repeated token, fewer distinct tokens than tokens is the one-step tell that the scan is needed)
+        if len(positions_1) < len(tokens_1) and \
+            any(len(positions_2[tok]) < len(spots) for tok, spots in positions_1.items() if len(spots)>1):
             return False
         
         # else we move right along
@@ -1385,10 +1704,8 @@ def tokens_in_tokens_sub_function(tokens_1: list, tokens_2: list):
             # these should in theory be ascending values as that means they appeared in the proper order
             
             # this is all of list 2's indices in order they appear.
-            # for example, "Wilma A Lewis" should looks like {Wilma: [0], A:[1], Lewis:[2]}
-            t2 = defaultdict(list)
-            for i,j in enumerate(tokens_2):
-                t2[j].append(i)
+            # for example, "Wilma A Lewis" should looks like {Wilma: (0,), A:(1,), Lewis:(2,)}
+            t2 = positions_2
             
             # All tokens in Lewis A matched into Wilma A Lewis, but now we can catch the ordering error
             #  (Lewis, 0) (A, 1) doesn't match the correct (Wilma, 0) (A, 1) (Lewis, 2)
@@ -1397,35 +1714,29 @@ def tokens_in_tokens_sub_function(tokens_1: list, tokens_2: list):
             # in list one, and the value is the location in list 2
             # [Lewis, A] looks like [2, 1] (third index - value 2 of the second list for Lewis,
             #  then the second index, value 1 for A)
-            tok2_inds = []
-            for token in tokens_1:
-                # grab the front index from the t2 Counter dict. This is the earliest appearance of
-                # the token in list 2
-                tok2_ind = t2[token][0]
-                # now reset the t2 to remove that front index since we are calling it a match, we want to pop it
-                # in a George H George scenario, if we matched the first George, the counter goes
-                # from {George: [0,2], H:[1]}
-                # to {George: [2], H:[1]}
-                t2[token] = t2[token][1:]
-                # now we append that index to our tracking list, this is a list of the order our tokens appear
-                tok2_inds.append(tok2_ind)
+            if len(positions_1) == len(tokens_1):
+                # no token repeats in list 1 (the usual case), so every token takes its earliest appearance in list 2
+                tok2_inds = [t2[token][0] for token in tokens_1]
+            else:
+                # how many appearances of each token have been used up so far (the cached map itself is never edited)
+                cursor = defaultdict(int)
+                tok2_inds = []
+                for token in tokens_1:
+                    # grab the earliest unused appearance of the token in list 2
+                    tok2_ind = t2[token][cursor[token]]
+                    # now bump the cursor past that index since we are calling it a match
+                    # in a George H George scenario, if we matched the first George, the cursor for George
+                    # goes from 0 to 1, so the next George lands on index 2 in {George: (0,2), H:(1,)}
+                    cursor[token] += 1
+                    # now we append that index to our tracking list, this is a list of the order our tokens appear
+                    tok2_inds.append(tok2_ind)
             
             # now that I have the order in which my tokens appear in the second list
-            # we will cycle and check that no greater value appears before a lesser value
+            # we check that no greater value appears before a lesser value
             # in the above examples [2,1] for Lewis A the order in Wilma A Lewis is out of order and we know its bad
-            for ind,tok_ind in enumerate(tok2_inds):
-                # comprehension - bools for if current element is always less than all following elements
-                checker = [tok_ind < i for i in tok2_inds[ind+1:]]
-                # if any of them are are False, the sum wont be the length
-                if sum(checker) == len(checker):
-                    continue
-                else:
-                    # mismatched, break (no point continuing we know it's bad)
-                    return False
-            
-            # if any of the indices fails the test for values to the right, then we know it's a failure
-            # if we made it to here, we successfully passed
-            return True
+            # every element being less than all following ones is the same as the list being ascending,
+            # and the indices are distinct positions, so it is compared against its sorted self
+            return tok2_inds == sorted(tok2_inds)
     
     # else means not all tokens appeared in list 2 at the start, kick out a failure
     else:
@@ -1439,6 +1750,9 @@ def tokens_in_string_algo(tokens: list, string_check: str):
     For example A A Milne is wholly in Robert A Milne  with just substrings, but this function confirms that 
     2 A's needed to appear in Robert A Milne as standalone tokens to qualify as "in the string"
 
+    No pipeline calls this anymore, the token-list check in tokens_in_tokens_sub_function_caller superseded it.
+    It is kept as the reference for the substring-based matching rules (internal oddities, cut-out duplicates)
+
     Args:
         tokens (list): list of string which are the tokenized form of an entity name
         string_check (str): the entity string we are determining if those tokens are in
@@ -1476,8 +1790,7 @@ def tokens_in_string_algo(tokens: list, string_check: str):
             # if it's a longer token we assume it's a genuine match
             else:
                 # don't catch liam in william, list in allister or ott in mcdermott, hon in anthony, etc.
-                internal_oddities = ['liam','list','ott', 'lau','hon']
-                if token in internal_oddities and token not in string_check.split():
+                if token in JG.internal_oddities and token not in string_check.split():
                     return False
                 # up the count, cut the string
                 match_count+=1
@@ -1500,8 +1813,9 @@ def tokens_in_string_algo(tokens: list, string_check: str):
         next_string = in_string
         for tok in tokens:
             if len(tok) == 1:
-                init_ind = next_string.split().index(tok)
-                init_ind = len(' '.join(next_string.split()[0:init_ind]).strip())
+                next_split = next_string.split()
+                init_ind = next_split.index(tok)
+                init_ind = len(' '.join(next_split[0:init_ind]).strip())
                 next_string = next_string[0:init_ind] + next_string[init_ind+len(tok):]
                 order_check.append(init_ind)
             else:
@@ -9,11 +9,13 @@ import support.court_functions as CF
 from JED_Utilities_public import write_to_jsonl_ucid_file
 
 import multiprocessing as mp
-from multiprocessing.dummy import Pool as ThreadPool
 
 import argparse
+import datetime
 import pandas as pd
+from bisect import bisect_right
 from collections import defaultdict, Counter
+from functools import lru_cache
 import tqdm
 import time
 
@@ -36,22 +38,21 @@ def load_fjc_appointments(fpath):
     judge_demographics_cols_cast = [
         'Court Type', 'Court Name', 'Appointment Title', 'Confirmation Date', 'Commission Date', 'Termination Date']
 
-    # extract rows from the dataframe, but make it a long frame instead of wide using dictionaries
-    new_rows = []
-    for index, row in FJC.iterrows():
-        # grab the columns named correctly as is
-        baseline = {key: row[key] for key in judge_demographics_cols_keys}
-        # there are 7 duplications of the wide columns, grab them all, we can filter nulls later
-        for i in range(1,7):
-            # save the same "key" information next to the appointment numbered information
-            this_it = baseline.copy()
-            this_it['Appointment Number'] = i
-            for key in judge_demographics_cols_cast:
-                this_it[key] = row[f'{key} ({i})']
-            new_rows.append(this_it)
-
-    # make into DF
-    fjc_expanded = pd.DataFrame(new_rows)
+    # make it a long frame instead of wide: one column-renamed slice per appointment number, stacked in one concat
+    # there are 7 duplications of the wide columns, grab them all, we can filter nulls later
+    slices = []
+    for i in range(1,7):
+        # save the same "key" information next to the appointment numbered information
+        this_it = FJC[judge_demographics_cols_keys].copy()
+        this_it['Appointment Number'] = i
+        for key in judge_demographics_cols_cast:
+            this_it[key] = FJC[f'{key} ({i})']
+        # label each row the way a judge by judge, appointment by appointment walk would have numbered it
+        this_it.index = range(i-1, 6*len(FJC), 6)
+        slices.append(this_it)
+
+    # make into DF (back in judge by judge order)
+    fjc_expanded = pd.concat(slices).sort_index()
     # drop NA's
     # NAs exist because we ranged to 7, but not all judges had 6 appointments
     fjc_expanded = fjc_expanded[(~fjc_expanded['Court Name'].isna())].copy() 
@@ -63,10 +64,27 @@ def load_fjc_appointments(fpath):
     name2abb = {c: CF.classify(c) for c in fjc_expanded['Court Name'].unique().tolist()}
     fjc_expanded['Court Name Abb'] = fjc_expanded['Court Name'].map(name2abb)
 
-    # fill nulls for termination to today (not yet terminated); convert date cols to datetimes
-    fjc_expanded['Termination Date'].fillna(pd.to_datetime('today').date(), inplace=True)
-    fjc_expanded['Commission Date'] = fjc_expanded['Commission Date'].apply(lambda x: pd.to_datetime(x).date())
-    fjc_expanded['Termination Date'] = fjc_expanded['Termination Date'].apply(lambda x: pd.to_datetime(x).date())
+    # convert date cols to dates: the same dates repeat across judges, so each distinct one is parsed once and mapped back
+    # the distinct dates are first parsed together in one call, each value read on its own format. Anything that
+    # did not come back as a date there (or everything, on a pandas without the mixed format) is parsed one at a time
+    for col in ['Commission Date', 'Termination Date']:
+        distinct_dates = fjc_expanded[col].drop_duplicates()
+        try:
+            stamps = pd.to_datetime(distinct_dates, format='mixed', errors='coerce').tolist()
+        except:
+            stamps = [pd.NaT]*len(distinct_dates)
+        parsed_dates = {}
+        for raw, stamp in zip(distinct_dates.tolist(), stamps):
+            if pd.isna(stamp):
+                # blanks stay missing, and so do bad entries
+                try:
+                    stamp = pd.to_datetime(raw)
+                except:
+                    stamp = pd.NaT
+            parsed_dates[raw] = stamp.date()
+        fjc_expanded[col] = fjc_expanded[col].map(parsed_dates)
+    # fill nulls for termination to today (not yet terminated)
+    fjc_expanded['Termination Date'] = fjc_expanded['Termination Date'].fillna(pd.Timestamp('today').date())
     
     return fjc_expanded
 
@@ -133,19 +151,11 @@ def create_lookup_fjc_dates(fjc_expanded):
     # init empty dict
     fjc_dict = {}
     # for every appointment in the FJC data (one NID could have multiple rows)
-    for index, row in fjc_expanded.iterrows():
-
-        nid = row['nid']
-        commdate = row['Commission Date']
-        termdate = row['Termination Date']
-        court = row['Court Name Abb']
-        ctype = row['Court Type']
-        # if this judge hasnt had an appointment yet in the dict
-        if nid not in fjc_dict:
-            fjc_dict[nid] = {commdate: (termdate, court, ctype, 'Article III')}
-        # else update this judges appointments
-        else:
-            fjc_dict[nid][commdate] = (termdate, court, ctype, 'Article III')
+    for nid, commdate, termdate, court, ctype in zip(
+        fjc_expanded['nid'].tolist(), fjc_expanded['Commission Date'].tolist(), fjc_expanded['Termination Date'].tolist(),
+        fjc_expanded['Court Name Abb'].tolist(), fjc_expanded['Court Type'].tolist()):
+        # start this judge's appointments if this is their first, else update them
+        fjc_dict.setdefault(nid, {})[commdate] = (termdate, court, ctype, 'Article III')
             
     return fjc_dict
     
@@ -160,24 +170,34 @@ def create_lookup_bamag_dates(BAMAG):
     """
     # init empty dict
     bamag_dict = {}
+    # start dates repeat across judges, so each distinct one is parsed once (None marks the ones that failed)
+    # the distinct dates are first parsed together in one call, each value read on its own format. Anything that
+    # did not come back as a date there (bad entries, blanks) is left to the one at a time parse below
+    parsed_starts = {}
+    distinct_starts = BAMAG['DATE_START'].drop_duplicates()
+    try:
+        stamps = pd.to_datetime(distinct_starts, format='mixed', errors='coerce').tolist()
+    except:
+        stamps = []
+    for raw, stamp in zip(distinct_starts.tolist(), stamps):
+        if not pd.isna(stamp):
+            parsed_starts[raw] = stamp.date()
     # for every appointment row (one ID could have multiple rows)
-    for index, row in BAMAG.iterrows():
-        jid = row['JUDGE_ID']
-        start_date = row['DATE_START']
-        end_date = row['DATE_END']
-        court = row['_court_abbrv']
-        institution = row['INSTITUTION']
+    for jid, start_date, end_date, court, institution in zip(
+        BAMAG['JUDGE_ID'].tolist(), BAMAG['DATE_START'].tolist(), BAMAG['DATE_END'].tolist(),
+        BAMAG['_court_abbrv'].tolist(), BAMAG['INSTITUTION'].tolist()):
 
         # there is a lot of wonkiness in the date formatting, we went for speed and bipassed fixing the bad entries
-        try:
-            start_date = pd.to_datetime(start_date).date()
-        except:
+        if start_date not in parsed_starts:
+            try:
+                parsed_starts[start_date] = pd.to_datetime(start_date).date()
+            except:
+                parsed_starts[start_date] = None
+        start_date = parsed_starts[start_date]
+        if start_date is None:
             continue
         # write the data into the dict by ID
-        if jid not in bamag_dict:
-            bamag_dict[jid] = {start_date: (end_date, court, institution, "Bankruptcy-Magistrate")}
-        else:
-            bamag_dict[jid][start_date] = (end_date, court, institution, "Bankruptcy-Magistrate")
+        bamag_dict.setdefault(jid, {})[start_date] = (end_date, court, institution, "Bankruptcy-Magistrate")
             
     return bamag_dict
     
@@ -207,19 +227,20 @@ def create_lookup_SJID_dates_labels(JEL, FJC_path, BAMAG_Positions):
     sjid_lookup = {}
     JEL_Labs = {}
     # for every known judge/SJID
-    for index, row in JEL.iterrows():
-        sjid = row['SJID']
+    for sjid, nid, nid_missing, ba_mag_id, ba_mag_missing, jel_label in zip(
+        JEL['SJID'].tolist(), JEL['NID'].tolist(), JEL['NID'].isna().tolist(),
+        JEL['BA_MAG_ID'].tolist(), JEL['BA_MAG_ID'].isna().tolist(), JEL['SCALES_Judge_Label'].tolist()):
         nid_data = {}
         ba_mag_data = {}
 
         # if there is an NID, grab the NID appointment data
-        if not pd.isna(row['NID']):
-            nid_data = fjc_dict.get(int(row['NID']))
+        if not nid_missing:
+            nid_data = fjc_dict.get(int(nid))
             if not nid_data:
                 nid_data = {}
         # if there is a BAMAG ID, grab the related appointment data
-        if not pd.isna(row['BA_MAG_ID']):
-            ba_mag_data = bamag_dict.get(row['BA_MAG_ID'])
+        if not ba_mag_missing:
+            ba_mag_data = bamag_dict.get(ba_mag_id)
             if not ba_mag_data:
                 ba_mag_data = {}
         # unpack the two ground truth sources into one dictionary for the SJID
@@ -229,13 +250,15 @@ def create_lookup_SJID_dates_labels(JEL, FJC_path, BAMAG_Positions):
         }
 
         # for every JEL row, also create a lookup of the post-disambiguation entity label
-        JEL_Labs[sjid] = row['SCALES_Judge_Label']
+        JEL_Labs[sjid] = jel_label
     
     return sjid_lookup, JEL_Labs
 
+@lru_cache(maxsize=None)
 def label_categorizer(each):
     """Given a label either from the FJC appointments or the BA/MAG dataset,
-    parse it into simple categories of "at-the-time" judge labels
+    parse it into simple categories of "at-the-time" judge labels. There are only a handful of distinct labels
+    across millions of SEL rows, so the categories are memoized
 
     Args:
         each (tuple or str): the label for the judge appointment (could be a tuple or just a string)
@@ -271,10 +294,29 @@ def label_categorizer(each):
     else:            
         # if it wasn't a tuple, it's the standard JEL string label for the entity
         return _replace_(each)
-    
-    return _replace_(each)
 
-def back_annotate_ucid_sel(fpath, sjid_lookup, sjid_bamag_lookup, JEL_Labs, pbar):
+@lru_cache(maxsize=8192)
+def parse_sel_date(raw):
+    """Convert an SEL entry or filing date into a real date. Docket dates repeat heavily, so the conversions are
+    memoized, and plain YYYY-MM-DD strings (nearly all of them) are read directly instead of through pandas
+
+    Args:
+        raw (str): the date as written in the SEL row (could be null or malformed)
+
+    Returns:
+        datetime.date: the date, or None if it could not be converted
+    """
+    if type(raw) == str and len(raw) == 10 and raw[4] == raw[7] == '-':
+        try:
+            return datetime.date.fromisoformat(raw)
+        except ValueError:
+            pass
+    try:
+        return pd.to_datetime(raw).date()
+    except:
+        return None
+
+def back_annotate_ucid_sel(fpath, sjid_lookup, sjid_bamag_lookup, JEL_Labs, pbar=None):
     """meta function that back-annotates a whole SEL file 
     (completely independent of any other files also being back-annotated)
 
@@ -283,11 +325,12 @@ def back_annotate_ucid_sel(fpath, sjid_lookup, sjid_bamag_lookup, JEL_Labs, pbar
         sjid_lookup (dict): a lookup dictionary, keyed by sjid for the date of appointments
         sjid_bamag_lookup (dict): a lookup dictionary, keyed by the ba/mag id and contains the inferred entity label
         JEL_Labs (dict): a lookup dictionary, keyed by sjid and contains the JEL post-disambiguation labels
-        pbar (tqdm.tqdm.): progress bar object
+        pbar (tqdm.tqdm., optional): progress bar object, when the caller is not tracking progress itself. Defaults to None.
     """
 
     # iterate the progress bar
-    pbar.update()
+    if pbar is not None:
+        pbar.update()
 
     # the filepath stem will be the file-name form UCID
     ucid = fpath.stem
@@ -305,6 +348,9 @@ def back_annotate_ucid_sel(fpath, sjid_lookup, sjid_bamag_lookup, JEL_Labs, pbar
     case_labels = defaultdict(list)
     # track the indices of the data rows we could not tag in the first pass because they had no entry or filing dates
     case_misses = []
+    # each judge's appointment dates sorted for the case, along with whether they
+    # are all real dates (a missing date compares false both ways, so only a clean list can be binary searched)
+    case_appointments = {}
 
     new_data = []
     # for every row of SEL data (a  json object)
@@ -318,9 +364,8 @@ def back_annotate_ucid_sel(fpath, sjid_lookup, sjid_bamag_lookup, JEL_Labs, pbar
             print(new_ucid, "does not have entry or filing date??")
 
         # try converting the SEL date to a real date
-        try:
-            D_date = pd.to_datetime(D_date).date()
-        except:
+        D_date = parse_sel_date(D_date)
+        if D_date is None:
             # if not, the date was null, or something else is whack about it
             case_misses.append(index)
             continue
@@ -329,12 +374,20 @@ def back_annotate_ucid_sel(fpath, sjid_lookup, sjid_bamag_lookup, JEL_Labs, pbar
         dates = sjid_lookup.get(D_sjid)
         if dates:
             # if there was ground truth data, let's sort the keys ascending so the earliest appointments are first in the list
-            sorted_dates = sorted(dates)
-            # we then want all appointments that came before but not after this docket entry date
-            keeps = [d for d in sorted_dates if D_date >= d]
-            if keeps:
+            if D_sjid not in case_appointments:
+                sorted_dates = sorted(dates)
+                case_appointments[D_sjid] = (sorted_dates, not any(pd.isna(d) for d in sorted_dates))
+            sorted_dates, searchable = case_appointments[D_sjid]
+            # we then want the last of the appointments that came before but not after this docket entry date
+            if searchable and not pd.isna(D_date):
+                # (binary search straight to the most recent one)
+                position = bisect_right(sorted_dates, D_date)
+                fin = sorted_dates[position-1] if position else None
+            else:
+                keeps = [d for d in sorted_dates if D_date >= d]
+                fin = keeps[-1] if keeps else None
+            if fin is not None:
                 # if there were appointments before this date, great the most recent appointment before this date is presumed to be this judges position at the time
-                fin = keeps[-1]
                 grab = dates[fin]
                 label = (grab[3], grab[2], grab[1])
             else:
@@ -364,25 +417,23 @@ def back_annotate_ucid_sel(fpath, sjid_lookup, sjid_bamag_lookup, JEL_Labs, pbar
         # if we succesfully labeled this judge, track it
         case_labels[D_sjid].append(label)
         # create the new output data row
-        out_data = {
-            **DATA,
-            'JUDGE_LABEL':  label_categorizer(label)
-        }
-        new_data.append(out_data)
+        # (the rows were loaded for this file alone, so the label is set on the row itself)
+        DATA['JUDGE_LABEL'] = label_categorizer(label)
+        new_data.append(DATA)
 
     # if we could not label the judge before,
     if case_misses:
+        # the majority label of every judge labeled on this case
+        majority = {sjid: Counter(labels).most_common(1)[0][0] for sjid, labels in case_labels.items()}
         for miss in case_misses:
             # if this judge was labeled in another row, see if there is a majority label we can use
             rowdat = sample_SEL[miss]
             rowsjid = rowdat['SJID']
 
-            if case_labels[rowsjid]:
-                label = Counter(case_labels[rowsjid]).most_common()[0][0]
-            else:
-                label = 'No Case Data'
+            label = majority.get(rowsjid, 'No Case Data')
 
-            new_data.append({**rowdat,'JUDGE_LABEL': label_categorizer(label)})
+            rowdat['JUDGE_LABEL'] = label_categorizer(label)
+            new_data.append(rowdat)
             
     # if we get to the end of the process and have not created the same amount of output rows as we ingested from the SEL file, flag it as an error
     # (this should never happen)
@@ -395,6 +446,29 @@ def back_annotate_ucid_sel(fpath, sjid_lookup, sjid_bamag_lookup, JEL_Labs, pbar
     
     return
 
+# the lookups every back-annotation worker reads from, handed to each worker process once when the pool starts
+_WORKER_LOOKUPS = ()
+
+def _init_back_annotation_worker(sjid_lookup, sjid_bamag_lookup, JEL_Labs):
+    """Pool initializer that stashes the back-annotation lookups in the worker process, so they are passed once
+    per worker (inherited outright where processes fork) instead of pickled alongside every file
+
+    Args:
+        sjid_lookup (dict): a lookup dictionary, keyed by sjid for the date of appointments
+        sjid_bamag_lookup (dict): a lookup dictionary, keyed by the ba/mag id and contains the inferred entity label
+        JEL_Labs (dict): a lookup dictionary, keyed by sjid and contains the JEL post-disambiguation labels
+    """
+    global _WORKER_LOOKUPS
+    _WORKER_LOOKUPS = (sjid_lookup, sjid_bamag_lookup, JEL_Labs)
+
+def _back_annotate_worker(fpath):
+    """Process pool task: back-annotate one SEL file using the lookups stashed by the pool initializer
+
+    Args:
+        fpath (pathlib.Path): a pathlib path to the SEL file
+    """
+    back_annotate_ucid_sel(fpath, *_WORKER_LOOKUPS)
+
 def back_annotate_directory(paths):
     """Given a group of paths (one of which points to the directory to back-annotate), back-annotate
     the SEL files
@@ -413,18 +487,24 @@ def back_annotate_directory(paths):
     sjid_lookup, JEL_Labs = create_lookup_SJID_dates_labels(JEL, paths['FJC_FILE'], paths['BAMAG_FILE'])
     sjid_bamag_lookup = create_lookup_bamag_roles(JEL)
 
-    # it is assumed that the highest level directory is the SEL Directory and that is where we are starting
-    for court in rundir.iterdir():
-        for year in court.iterdir():
-            N = len(list(year.glob('*.jsonl')))
-            pbar = tqdm.tqdm(total=N, desc=f"{court.stem}-{year.stem}")
-
-            # pool = ThreadPool(mp.cpu_count()-1)
-            pool = ThreadPool(4)
-            results = pool.starmap(back_annotate_ucid_sel,  [(jsonl, sjid_lookup, sjid_bamag_lookup, JEL_Labs, pbar) for jsonl in year.glob('*.jsonl')])
-            pool.close()
-            pool.join()
-            pbar.close()
+    # every file is back-annotated independently and the work is pure python, so the files are spread across a process pool
+    # (threads would all wait on the GIL). The lookups go to each worker once through the initializer.
+    # Save one processor so as not to overload the computer for the user
+    with mp.Pool(max(1, mp.cpu_count()-1), initializer=_init_back_annotation_worker,
+                 initargs=(sjid_lookup, sjid_bamag_lookup, JEL_Labs)) as pool:
+
+        # it is assumed that the highest level directory is the SEL Directory and that is where we are starting
+        for court in rundir.iterdir():
+            for year in court.iterdir():
+                jsonls = list(year.glob('*.jsonl'))
+                # the progress bar is advanced here in the parent as the workers finish each file
+                pbar = tqdm.tqdm(total=len(jsonls), desc=f"{court.stem}-{year.stem}")
+                for _ in pool.imap_unordered(_back_annotate_worker, jsonls, chunksize=32):
+                    pbar.update()
+                pbar.close()
+
+        pool.close()
+        pool.join()
     
     return
 
@@ -1,8 +1,10 @@
 
+import sys
 import JED_Utilities_public as JU
 import JED_Helpers_public as JH
 import JED_Globals_public as JG
 import pandas as pd
+from rapidfuzz.utils import default_process
 
 class IntraMatch(object):
     """Parent class used for disambiguation. The class represents an entity string with meta-information related to it
@@ -10,6 +12,15 @@ class IntraMatch(object):
     Args:
         object (obj): Python object representation to be used in disambiguation node pools
     """
+    # fixed attribute layout, the disambiguation loops read these attributes millions of times
+    # NOTE: any new attribute set on the node needs to be declared here (or on the derivative class)
+    __slots__ = ('log', 'serial_id', 'name', 'n_ucids',
+                 'base_tokens', 'inferred_tokens', 'nicknames_tokens', 'unified_names_tokens',
+                 'eligible', 'POINTS_TO', 'POINTS_TO_SID', 'children', 'Possible_Pointers', 'is_ambiguous',
+                 'token_length', 'suffix', 'anchor', 'init_init_sur_suff',
+                 'initials_wo_suff', 'tokens_wo_suff', 'initials_w_suff',
+                 'name_signature', 'anchor_signature', 'nickname_pool_tokens', 'processed_name', 'first_token')
+
     def __init__(self,  cleaned_name: str, n_ucids: int, additional_reprs: list = None, SID: int = 0):
         """Initialize the object
 
@@ -27,13 +38,17 @@ class IntraMatch(object):
 
         # cleaned name string
         self.name = cleaned_name
+        # the name as the token based fuzzy scorers process it (lower case, punctuation stripped), done once here
+        # so the scorers can be called without a processor in the matching loops
+        self.processed_name = default_process(cleaned_name)
         # number of ucids the entity appeared on
         self.n_ucids = n_ucids
 
-        # split the name on simple whitespace
-        self.base_tokens = cleaned_name.split()
+        # split the name on simple whitespace, interning the tokens so the token equality checks
+        # all over the matching pipes short-circuit on identity
+        self.base_tokens = tuple(sys.intern(tok) for tok in cleaned_name.split())
         # specialty function that builds initialed forms of the name (i.e. John Robert Smith --> J R Smith, John R Smith, J Robert Smith)
-        self.inferred_tokens = JH.build_inferred_tokens(self.base_tokens)
+        self.inferred_tokens = JH.build_inferred_tokens(list(self.base_tokens))
         if additional_reprs:
             for additional in additional_reprs:
                 ADDS = JH.build_inferred_tokens(additional.split())
@@ -50,6 +65,17 @@ class IntraMatch(object):
                 # if the base tokens can be cast to nicknames or universal spellings, make them both as plain and also abbreviated forms
                 self.nicknames_tokens[fi][mi],self.unified_names_tokens[fi][mi] = JH.build_nicknames_and_unified(self.inferred_tokens[fi][mi])
 
+        # the token pools are only read from here on, freeze them into tuples of tuples once
+        # (interning every token too, so equal tokens share one string)
+        # the nickname pool is the inferred + nickname tokens together, tokens in tokens compares them in both directions
+        self.nickname_pool_tokens = {True:{}, False:{}}
+        for fi in [True, False]:
+            for mi in [True, False]:
+                self.inferred_tokens[fi][mi] = tuple(tuple(sys.intern(tok) for tok in toks) for toks in self.inferred_tokens[fi][mi])
+                self.nicknames_tokens[fi][mi] = tuple(tuple(sys.intern(tok) for tok in toks) for toks in self.nicknames_tokens[fi][mi])
+                self.unified_names_tokens[fi][mi] = tuple(tuple(sys.intern(tok) for tok in toks) for toks in self.unified_names_tokens[fi][mi])
+                self.nickname_pool_tokens[fi][mi] = self.inferred_tokens[fi][mi] + self.nicknames_tokens[fi][mi]
+
         # all nodes start as eligible to be mapped to, pointing to themselevs, and have no children
         self.eligible = True
         self.POINTS_TO = '>>SELF<<'
@@ -63,25 +89,33 @@ class IntraMatch(object):
 
         # determine if this is a "jr", "sr",etc. name, if so find the suffix
         # also build the initials of the judge entity
-        if self.base_tokens[-1] in JG.suffixes_titles:
+        if self.base_tokens[-1] in JG.suffixes_titles_set:
             self.suffix = self.base_tokens[-1]
             if self.token_length==1:
                 self.anchor = None
-                self.init_init_sur_suff = f'{self.suffix}'
+                self.init_init_sur_suff = self.suffix
             else:
                 self.anchor = self.base_tokens[-2]
-                self.init_init_sur_suff = f'{" ".join(tok[0] for tok in self.base_tokens[0:-2])} {self.anchor} {self.suffix}'
+                self.init_init_sur_suff = sys.intern(f'{" ".join(tok[0] for tok in self.base_tokens[0:-2])} {self.anchor} {self.suffix}')
             self.initials_wo_suff = [tok[0] for tok in self.base_tokens[0:-1]]
-            self.tokens_wo_suff = [tok for tok in self.base_tokens[0:-1]]
+            self.tokens_wo_suff = self.base_tokens[0:-1]
         else:
             self.suffix=None
             self.anchor = self.base_tokens[-1]
-            self.init_init_sur_suff = f'{" ".join(tok[0] for tok in self.base_tokens[0:-1])} {self.anchor}'
+            self.init_init_sur_suff = sys.intern(f'{" ".join(tok[0] for tok in self.base_tokens[0:-1])} {self.anchor}')
             self.initials_wo_suff = [tok[0] for tok in self.base_tokens]
             self.tokens_wo_suff = self.base_tokens
         
 
         self.initials_w_suff = [tok[0] for tok in self.base_tokens]
+        # first token of the suffixless name (the last one is the anchor), read constantly in the pairwise pipes
+        # a lone suffix has no suffixless tokens at all
+        self.first_token = self.tokens_wo_suff[0] if self.tokens_wo_suff else None
+
+        # sorted-character signatures of the name and surname, two strings are anagrams (same letters, typoed order)
+        # exactly when their signatures are equal
+        self.name_signature = "".join(sorted(self.name))
+        self.anchor_signature = "".join(sorted(self.anchor)) if self.anchor else None
 
     def adopt_children(self, other, method: str, where: str):
         """method used to assign another entity node to this node as the parent entity
@@ -292,6 +326,8 @@ class UCIDMatch(IntraMatch):
     Args:
         IntraMatch (obj): parent class
     """
+    __slots__ = ('ucid', 'was_header')
+
     def __init__(self,  name, ucid, n_ucids, was_header):
         """init method to build the nodes
 
@@ -311,6 +347,8 @@ class CourtMatch(IntraMatch):
     Args:
         IntraMatch (obj): parent class
     """
+    __slots__ = ('court',)
+
     def __init__(self,  name, court, n_ucids):
         """init method to build nodes
 
@@ -328,6 +366,8 @@ class FreeMatch(IntraMatch):
     Args:
         IntraMatch (obj): parent class
     """
+    __slots__ = ('is_FJC', 'is_BA_MAG', 'NID', 'BA_MAG_ID', 'courts', 'has_SJID', 'SJID')
+
     def __init__(self,  name: str, additional_reprs: list, n_ucids: int, courts: list =[], 
         FJC_NID: int = None, BA_MAG_ID: str = None, serial_id: int = 0, SJID: str = "Inconclusive"):
         """init method for freeform disambiguation nodes
@@ -562,8 +602,9 @@ class FreeMatch(IntraMatch):
         if self.has_SJID and other.has_SJID:
             # this shouldnt happen
             print("FAILURE DETECTED", method, where)
-            print(vars(self))
-            print(vars(other))
+            # slotted nodes have no __dict__, print the identifying attributes instead
+            print(self.name, self.SJID, self.NID, self.BA_MAG_ID, self.serial_id)
+            print(other.name, other.SJID, other.NID, other.BA_MAG_ID, other.serial_id)
             
         elif not self.has_SJID and other.has_SJID:   
             # if the other NODE had an SJID, but this one wins
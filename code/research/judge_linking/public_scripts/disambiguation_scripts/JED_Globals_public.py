@@ -10,7 +10,14 @@ from flashtext.keyword import KeywordProcessor
 accent_repl = str.maketrans("áàéêéíóöúüñ","aaeeeioouun")
 
 suffixes_titles = ['i', 'ii', 'iii', 'iv', 'v', 'jr','jnr', 'snr', 'sr', 'senior','junior']
+# hashed form for membership checks in the disambiguation loops (the list stays ordered for the regex builders below)
+suffixes_titles_set = frozenset(suffixes_titles)
 common_surnames = ['lee','smith','johnson','williams', 'moody', 'thomas']
+# botched leading tokens that get split off a surname ("o connor", "mc donald", "van geulen") or read as judge ("j mathison")
+anchor_prefixes = frozenset({'jude', 'j', 'o', 'mc', 'van'})
+# tokens that show up inside longer names and should only match as whole tokens (liam in william, list in allister,
+# ott in mcdermott, hon in anthony, etc.)
+internal_oddities = frozenset({'liam', 'list', 'ott', 'lau', 'hon'})
 
 # unified spellings of names
 NAME_UNIFIER = {    
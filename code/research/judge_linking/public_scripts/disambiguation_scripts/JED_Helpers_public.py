@@ -54,7 +54,7 @@ def build_entity_tokens(token_list: list, abbreviated_first: bool = False, abbre
 
 
     # if the final token is in fact a suffix, let's identify it
-    if token_list[-1] in JG.suffixes_titles:
+    if token_list[-1] in JG.suffixes_titles_set:
         # found it
         the_suffix = [token_list[-1]]
         # yes this token list has a special suffix
@@ -1,5 +1,6 @@
 import pandas as pd
 import tqdm
+import multiprocessing as mp
 
 from collections import defaultdict
 import JED_Classes_public as JED_Classes
@@ -8,8 +9,6 @@ import JED_Algorithms_public as JA
 import JED_Utilities_public as JU
 import JED_Globals_public as JG
 
-from fuzzywuzzy import fuzz
-
 def PIPELINE_Disambiguation_Prep(entry_frame: pd.DataFrame, header_frame: pd.DataFrame, JEL=[]):
     """Preliminary cleaning and respanning to prep the data for disambiguation
 
@@ -365,9 +364,14 @@ def UCID_MATCH_PIPELINE(FDF: pd.DataFrame, parties: pd.DataFrame, counsels: pd.D
     ucid_map, toss_map = PIPE_Prepare_for_UCID_Layer(FDF, parties, counsels)
    
     # NEED NEW_MAP IN THE END
-    end_map = {}
-    for ucid, entity_list in ucid_map.items():
-        end_map[ucid] = Single_UCID_Pipeline(entity_list, ucid)
+    # every ucid is disambiguated independently of the others, so the ucids are spread across a process pool
+    # the workers hand back their (pickled) copies of the objects with the updated pointers, those become the end map
+    # save one processor so as not to overload the computer for the user, the workers log to the same file as this process
+    with mp.Pool(max(1, mp.cpu_count()-1), initializer=JU.init_worker_log, initargs=(JU.current_log_file(),)) as pool:
+        reduced = pool.starmap(Single_UCID_Pipeline, [(entity_list, ucid) for ucid, entity_list in ucid_map.items()], chunksize=64)
+        pool.close()
+        pool.join()
+    end_map = dict(zip(ucid_map.keys(), reduced))
     
     UCID_df = UCID_PIPE_Build_Remapped_Lookup(end_map, toss_map, FDF) # remap into a Dataframe
     # in frame shape will not match outframe shape if any parties or counsels were detected and dropped
@@ -430,9 +434,18 @@ def COURT_MATCH_PIPELINE(Post_UCID: pd.DataFrame, fjc_active: pd.DataFrame, ba_m
             unallocated_remainder+=objs
 
     # disambiguate within each court
-    court_map = {}
-    for court in set(court_map_long.keys()).union(court_map_single.keys()):
-        court_map[court] = Single_Court_Pipeline(court_map_long[court], court_map_single[court], court)
+    # courts are disambiguated independently of each other, so like the ucids they are spread across a process pool
+    # courts vary a lot in size, so they are handed out one at a time, largest first
+    # (the pairwise work grows with the square of a court's size, starting the big ones early keeps one straggler
+    # from running alone at the end; ties fall back on the court name so the order is stable)
+    courts = sorted(set(court_map_long.keys()).union(court_map_single.keys()),
+                    key=lambda court: (-(len(court_map_long[court])+len(court_map_single[court])), court))
+    # the workers log to the same file as this process
+    with mp.Pool(max(1, mp.cpu_count()-1), initializer=JU.init_worker_log, initargs=(JU.current_log_file(),)) as pool:
+        reduced = pool.starmap(Single_Court_Pipeline, [(court_map_long[court], court_map_single[court], court) for court in courts], chunksize=1)
+        pool.close()
+        pool.join()
+    court_map = dict(zip(courts, reduced))
 
     # after disambiguation, rebuild the entity dataframe
     ID_Mappings, ALL_NODE_IDs = COURT_PIPE_Build_Remapped_Lookup(court_map, unallocated_remainder, Post_UCID, GDF)
@@ -766,8 +779,14 @@ def COURT_PIPE_Object_Builder(Post_UCID, serial_init = 0):
     court_map_single = {}
     court_map_long = {}
     for court, objects in court_map.items():
-        court_map_single[court] = [o for o in objects if o.token_length==1 or len(o.tokens_wo_suff)==1]
-        court_map_long[court] = [o for o in objects if o not in court_map_single[court]]
+        # split in one pass
+        court_map_single[court] = []
+        court_map_long[court] = []
+        for o in objects:
+            if o.token_length==1 or len(o.tokens_wo_suff)==1:
+                court_map_single[court].append(o)
+            else:
+                court_map_long[court].append(o)
 
     print(">> Objects Built")
     
@@ -1307,14 +1326,14 @@ def PIPE_LABEL_AND_BUILD(PCID_Mappings, FINAL_NODE_LOOKUP, IREM):
             ))
 
     # instant rejection for entities with less than 3 unique ucids is not fjc and is a single token name
-    bads = []
+    bads = set()
     for o in AMS:
         if o.Tot_UCIDs<=3:
             if not o.is_FJC and not o.is_BA_MAG and len(o.tokens_wo_suff)==1:
-                bads.append(o)
+                bads.add(o)
         if len(o.tokens_wo_suff)==1 or len(o.base_tokens)==1:
             if o not in bads:
-                bads.append(o)
+                bads.add(o)
 
     goods = [o for o in AMS if o not in bads]
 
@@ -1324,8 +1343,14 @@ def PIPE_LABEL_AND_BUILD(PCID_Mappings, FINAL_NODE_LOOKUP, IREM):
 
     # once a label has been generated...
     # keep any node that was not denied, reject otherwise
-    kept = [o for o in goods if 'deny' not in o.SCALES_Guess]
-    rejected = [o for o in goods if 'deny' in o.SCALES_Guess]
+    # (split in one pass over the labelled nodes)
+    kept = []
+    rejected = []
+    for o in goods:
+        if 'deny' in o.SCALES_Guess:
+            rejected.append(o)
+        else:
+            kept.append(o)
 
     # now generate the SJIDs for the kept entities
     for i, obj in enumerate(kept):
@@ -1377,7 +1402,6 @@ def PIPE_LABEL_AND_BUILD(PCID_Mappings, FINAL_NODE_LOOKUP, IREM):
 
 import os
 import json
-import multiprocessing as mp
 
 def LOAD_JSONL(fpath):
     """Given a filepath to a JSONL SEL file, load it into memory as a list of the JSON objects
@@ -1391,10 +1415,8 @@ def LOAD_JSONL(fpath):
     # if its a real file, load it
     if os.path.isfile(fpath):
         with open(fpath, 'r') as json_file:
-            json_list = list(json_file)
-            results = []
-            for json_str in json_list:
-                results.append(json.loads(json_str))
+            # decode line by line straight off the file, no intermediate list of the raw lines
+            results = [json.loads(json_str) for json_str in json_file]
 
         return results
     else:
@@ -1690,28 +1712,23 @@ def PIPE_Update_Final_Repoint(Post_Court, FIN_NODES):
 
     # any remaining eligible node will point to itself as the parent
     self_points = []
-    for obj in [o for o in FIN_NODES if o.eligible]:
-        self_points.append(
-                {'Updated_Points_To':obj.name,
-                'Final_Pointer': obj.POINTS_TO,
-                'is_FJC':obj.is_FJC,
-                'NID':obj.NID,
-                'SJID': obj.SJID}
-            )
-    # construct a dataframe of entities that are themselves the parent representative entity name
-    SP = pd.DataFrame(self_points)
-
-    # now generate the child entities data that takes the child entity representation and points it to the parent (final pointer)
+    # the ineligible nodes are the child entities, their data takes the child entity representation and points it to the parent (final pointer)
     ineligible = []
-    for obj in [o for o in FIN_NODES if not o.eligible]:
-        ineligible.append(
-                {'Updated_Points_To':obj.name,
+    # both are built in a single pass over the nodes
+    for obj in FIN_NODES:
+        row = {'Updated_Points_To':obj.name,
                 'Final_Pointer': obj.POINTS_TO,
                 'is_FJC':obj.is_FJC,
                 'NID':obj.NID,
                 'SJID': obj.SJID}
-            )
+        if obj.eligible:
+            self_points.append(row)
+        else:
+            ineligible.append(row)
 
+    # construct a dataframe of entities that are themselves the parent representative entity name
+    SP = pd.DataFrame(self_points)
+    # and the child entities
     IE = pd.DataFrame(ineligible)
 
     # create the lookup dataframe with appropriate suffixes
@@ -2008,14 +2025,14 @@ def PIPE_UPDATE_Assign_and_ReLabel(PCID: pd.DataFrame, FIN_LOOKUP: pd.DataFrame,
             ))
 
     # instant rejection for entities with less than 3 unique ucids is not fjc and is a single token name
-    bads = []
+    bads = set()
     for o in AMS:
         if o.Tot_UCIDs<=3:
             if not o.is_FJC and not o.is_BA_MAG and len(o.tokens_wo_suff)==1:
-                bads.append(o)
+                bads.add(o)
         if len(o.tokens_wo_suff)==1 or len(o.base_tokens)==1:
             if o not in bads:
-                bads.append(o)
+                bads.add(o)
 
     goods = [o for o in AMS if o not in bads]
 
@@ -2025,8 +2042,14 @@ def PIPE_UPDATE_Assign_and_ReLabel(PCID: pd.DataFrame, FIN_LOOKUP: pd.DataFrame,
 
     # once a label has been generated...
     # keep any node that was not denied, reject otherwise
-    kept = [o for o in goods if 'deny' not in o.SCALES_Guess]
-    rejected = [o for o in goods if 'deny' in o.SCALES_Guess]
+    # (split in one pass over the labelled nodes)
+    kept = []
+    rejected = []
+    for o in goods:
+        if 'deny' in o.SCALES_Guess:
+            rejected.append(o)
+        else:
+            kept.append(o)
 
     # mark the remaining entities as inconclusive
     for obj in rejected:
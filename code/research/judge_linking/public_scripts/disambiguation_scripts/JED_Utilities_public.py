@@ -405,6 +405,29 @@ def log_message(msg):
     my_log.info(msg)
     return
 
+def current_log_file():
+    """utility to find the file the current environments log is writing to, so worker processes can write there too
+
+    Returns:
+        str: path to the log file, or None if the log is not writing to a file
+    """
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.FileHandler):
+            return handler.baseFilename
+    return None
+
+def init_worker_log(log_file):
+    """Pool initializer that points a worker processes log at the run's log file
+    forked workers already inherit the handler (basicConfig is then a no-op), spawned workers start without one
+
+    Args:
+        log_file (str): path to the log file, from current_log_file
+    """
+    if log_file:
+        # same setup as the config ingestion so the worker's lines read like the parent's
+        logging.basicConfig(filename= log_file, format='%(message)s', level = logging.INFO)
+    return
+
 
 def UPDATE_TO_JSONL(Post_UCID, paths):
     """when updating new cases with entities, use this writer
@@ -592,7 +615,8 @@ def write_to_jsonl_ucid_file(inp):
     fpath, datum = inp
     with open(fpath, 'w') as fout:
         # ty greg for the valid jsonl code
-        fout.writelines('\n'.join(json.dumps(line) for line in datum))
+        # (one write of the joined string: writelines on a plain string hands it over one character at a time)
+        fout.write('\n'.join(json.dumps(line) for line in datum))
     return
 
 
@@ -62,9 +62,8 @@ def load_SEL(ucid, as_df = True):
         results = []
         if fname.exists():
             with open(fname, 'r') as json_file:
-                json_list = list(json_file)
-                for json_str in json_list:
-                    results.append(json.loads(json_str))
+                # decode line by line straight off the file, no intermediate list of the raw lines
+                results = [json.loads(json_str) for json_str in json_file]
 
         SEL_rows+=results
 